@@ -1,13 +1,16 @@
 USE defaultdb;
 
+-- python -m benchmark load --backend cockroachdb creates this table itself;
+-- kept for loading the data by hand
 CREATE TABLE user_review (
+    id INT PRIMARY KEY DEFAULT unique_rowid(),
     rating INT,
-    title TEXT,
-    text TEXT,
-    asin TEXT,
-    parent_asin TEXT,
-    user_id TEXT,
-    timestamp TEXT,
+    title STRING,
+    text STRING,
+    asin STRING,
+    parent_asin STRING,
+    user_id STRING,
+    timestamp STRING,
     helpful_vote INT,
     verified_purchase BOOL
 );
@@ -15,4 +18,4 @@ CREATE TABLE user_review (
 SELECT username FROM system.users;
 
 -- Step 3: Verify the data was inserted correctly
-SELECT * FROM user_review;
\ No newline at end of file
+SELECT * FROM user_review;
@@ -1,29 +1,10 @@
-import pandas as pd
-import pymongo
+# thin entry point kept for the old upload command; the loader streams
+# Dataset/dtb_100,000.xlsx in chunks over several connections (see benchmark/loader.py)
+import sys
+from pathlib import Path
 
-# read CSV
-df = pd.read_excel(r"Dataset\dtb_100,000.xlsx")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-# connect to MongoDB
-connection = pymongo.MongoClient("mongodb://localhost:27017/")
-db = connection["first100k"]                  # database name
-collection = db["user_review"]              # collection name
+from benchmark.__main__ import main
 
-# clear previous collection data
-collection.delete_many({})
-
-# Iisert data
-for _, row in df.iterrows():
-    collection.insert_one({
-        'rating': row['rating'],
-        'title': row['title'],
-        'text': row['text'],
-        'asin': row['asin'],
-        'parent_asin': row['parent_asin'],
-        'user_id': row['user_id'],
-        'timestamp': str(row['timestamp']),
-        'helpful_vote': row['helpful_vote'],
-        'verified_purchase': row['verified_purchase']
-    })
-
-print("CSV data successfully uploaded to amazon.user_review")
+main(["load", "--backend", "mongodb", *sys.argv[1:]])
@@ -0,0 +1,7 @@
+"""Shared benchmark engine for the MongoDB vs CockroachDB evaluation.
+
+Every workload is written once against the backend adapter interface in
+``benchmark.backends`` and run with the same timing code on either database:
+
+    python -m benchmark data_manipulation --backend all
+"""
@@ -0,0 +1,232 @@
+import argparse
+import os
+from pathlib import Path
+
+from benchmark import config, plotting, profiler
+from benchmark.backends import BACKENDS, get_async_backend, get_backend
+from benchmark.backends.base import POOL_MAX, POOL_MIN, Backend
+from benchmark.dataset import convert_all
+from benchmark.loader import DEFAULT_SOURCE, load
+from benchmark.report import report
+from benchmark.results import ResultsStore, compare, list_runs, resume_options, server_version
+from benchmark.scheduler import ScheduledWorkload
+from benchmark.workloads import WORKLOADS
+
+# command name -> fn(backend, options)
+COMMANDS = {"load": load, **WORKLOADS}
+
+# workloads that get an unconnected asyncio backend and connect it themselves
+ASYNC_WORKLOADS = ("async_queries",)
+
+# commands that do not talk to a database: fn(options)
+LOCAL_COMMANDS = {"convert": convert_all, "compare": compare, "report": report, "runs": list_runs}
+
+
+def int_list(text):
+    return [int(s) for s in text.split(",")]
+
+
+def name_list(text):
+    return text.split(",")
+
+
+def batch_list(text):
+    """Comma separated batch sizes; "all" means one batch of everything (None)."""
+    return [None if s == "all" else int(s) for s in text.split(",")]
+
+
+def statement_modes(text):
+    modes = name_list(text)
+    unknown = set(modes) - set(Backend.STATEMENT_MODES)
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown statement mode(s): {', '.join(sorted(unknown))}")
+    return modes
+
+
+def float_list(text):
+    return [float(s) for s in text.split(",")]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmark",
+        description="Run a workload against MongoDB and/or CockroachDB.",
+    )
+    parser.add_argument("workload", choices=sorted({**COMMANDS, **LOCAL_COMMANDS}))
+    parser.add_argument("--backend", choices=[*BACKENDS, "all"], default="all")
+    parser.add_argument("--sizes", type=int_list, default=config.SAMPLE_SIZES,
+                        help="comma separated data sizes (default 10k..100k)")
+    parser.add_argument("--concurrency", type=int_list, default=config.CONCURRENT_COUNTS,
+                        help="comma separated concurrency levels for concurrent_queries")
+    parser.add_argument("--async-concurrency", type=int_list, default=config.ASYNC_CONCURRENCY,
+                        help="comma separated in-flight query counts for async_queries")
+    parser.add_argument("--pool-min", type=int, default=POOL_MIN,
+                        help="minimum connections kept in each driver pool")
+    parser.add_argument("--pool-max", type=int, default=POOL_MAX,
+                        help="maximum connections in each driver pool")
+    parser.add_argument("--processes", type=int, default=os.cpu_count(),
+                        help="worker processes started by fleet")
+    parser.add_argument("--threads", type=int, default=4,
+                        help="client threads per fleet worker process, and transactions clients")
+    parser.add_argument("--queries", type=name_list, default=None,
+                        help="comma separated subset of the shared query set (default all)")
+    parser.add_argument("--rates", type=float_list, default=config.OPEN_LOOP_RATES,
+                        help="comma separated arrival rates (queries/s) stepped through by open_loop")
+    parser.add_argument("--duration", type=float, default=30.0,
+                        help="seconds each open_loop rate / async_queries level / fleet run is held")
+    parser.add_argument("--max-in-flight", type=int, default=64,
+                        help="client threads available to open_loop")
+    parser.add_argument("--slo-ms", type=float, default=1000.0,
+                        help="open_loop treats a p99 above this as saturation")
+    parser.add_argument("--insert-strategy", choices=["values", "executemany", "copy", "raw_bson"], default="values",
+                        help="CockroachDB bulk insert path: multi-row INSERT, one INSERT per row, or COPY FROM STDIN; "
+                             "raw_bson makes MongoDB encode records to BSON once and reuse the bytes")
+    parser.add_argument("--raw-reads", action="store_true",
+                        help="MongoDB queries return undecoded RawBSONDocuments")
+    parser.add_argument("--statement-modes", type=statement_modes, default=["text"],
+                        help="comma separated single-operation modes for data_manipulation: text, prepared")
+    parser.add_argument("--consistency", type=name_list, default=["default"],
+                        help="comma separated durability/consistency levels for data_manipulation and "
+                             "concurrent_queries; MongoDB: w0, w1, journaled, majority, available, linearizable; "
+                             "CockroachDB: serializable, read_committed, follower_read, stale_10s "
+                             "(levels a database does not know are skipped for it)")
+    parser.add_argument("--batch-sizes", type=int_list, default=[100, 1_000, 10_000],
+                        help="cursor batch sizes (Mongo batch_size / CockroachDB itersize) for streaming")
+    parser.add_argument("--write-batch-sizes", type=batch_list, default=[1, 10, 100, 1_000, 10_000, None],
+                        help="comma separated write batch sizes for batch_size; 'all' sends everything at once")
+    parser.add_argument("--hot-keys", type=int_list, default=[10_000, 1_000, 100, 10, 2],
+                        help="comma separated hot set sizes stepped through by transactions (smaller = more contention)")
+    parser.add_argument("--hot-fraction", type=float, default=0.9,
+                        help="share of transactions that pick their keys from the hot set")
+    parser.add_argument("--txn-keys", type=int, default=2,
+                        help="records read and updated by each transaction")
+    parser.add_argument("--max-retries", type=int, default=10,
+                        help="retries after a conflict before a transaction counts as aborted")
+    parser.add_argument("--sample-interval", type=float, default=0.5,
+                        help="seconds between resource samples in memory_usage")
+    parser.add_argument("--warmup", type=int, default=1,
+                        help="unrecorded passes of every cell before measuring (scheduled workloads)")
+    parser.add_argument("--repetitions", type=int, default=3,
+                        help="recorded passes of every cell; summarized as mean/median with a 95%% CI")
+    parser.add_argument("--data", choices=["synthetic", "fixed"], default="synthetic",
+                        help="generated records: skewed synthetic reviews, or copies of one fixed doc")
+    parser.add_argument("--seed", type=int, default=42, help="synthetic data seed")
+    parser.add_argument("--users", type=int, default=100_000, help="distinct synthetic user_ids")
+    parser.add_argument("--products", type=int, default=20_000, help="distinct synthetic asins")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent for user_id / asin popularity")
+    parser.add_argument("--same-parent-ratio", type=float, default=0.6,
+                        help="share of synthetic records with asin == parent_asin")
+    parser.add_argument("--synthetic", type=int, default=None,
+                        help="load this many synthetic records instead of --source")
+    parser.add_argument("--source", default=DEFAULT_SOURCE,
+                        help="dataset file (.xlsx or .csv) for load")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="parallel connections used by load")
+    parser.add_argument("--chunk-size", type=int, default=5_000,
+                        help="rows per bulk insert batch for load")
+    parser.add_argument("--results", type=Path, default=config.RESULTS_DB,
+                        help="SQLite file every run is recorded in")
+    parser.add_argument("--resume", type=int, default=None,
+                        help="continue an unfinished run of a scheduled workload, skipping its recorded cells")
+    parser.add_argument("--baseline", type=int, default=None,
+                        help="run id compare measures against")
+    parser.add_argument("--run", type=int, default=None,
+                        help="run id compare checks (default: latest run of the same workload)")
+    parser.add_argument("--threshold", type=float, default=0.05,
+                        help="relative slowdown compare must be confident of to flag a regression")
+    parser.add_argument("--runs", type=int_list, default=None,
+                        help="comma separated run ids for report (default: latest run of every workload)")
+    parser.add_argument("--output", type=Path, default=config.ROOT / "Results" / "report.html",
+                        help="HTML file written by report")
+    parser.add_argument("--no-plots", action="store_true",
+                        help="skip the per-backend PNGs (matplotlib is then never imported)")
+    parser.add_argument("--growth", action="store_true",
+                        help="query_optimization: run sizes in ascending order and append only the delta "
+                             "between them instead of recloning the subset")
+    parser.add_argument("--explain", action="store_true",
+                        help="capture explain(executionStats) / EXPLAIN ANALYZE of every benchmarked query "
+                             "into the results store")
+    parser.add_argument("--profile", action="store_true",
+                        help="split measured time into encode / network / server / decode / client "
+                             "(adds overhead; not comparable with plain runs)")
+    parser.add_argument("--profile-sample", type=float, default=None, metavar="MS",
+                        help="with --profile, also sample client stacks every MS milliseconds")
+    return parser
+
+
+def store_plans(store, run_id, results):
+    """Move the plans captured with --explain out of the workload results into their own table."""
+    for name, result in results.items():
+        if isinstance(result, dict) and "plans" in result:
+            store.add_plans(run_id, name, result.pop("plans"))
+
+
+def main(argv=None):
+    options = build_parser().parse_args(argv)
+    if options.workload in LOCAL_COMMANDS:
+        LOCAL_COMMANDS[options.workload](options)
+        return
+    workload = COMMANDS[options.workload]
+    with ResultsStore(options.results) as store:
+        if options.resume is not None:
+            if not isinstance(workload, ScheduledWorkload):
+                raise SystemExit(f"{options.workload} is not split into cells and cannot be resumed")
+            options = resume_options(options, store.run(options.resume))
+            run_id, done = options.resume, store.done_passes(options.resume)
+        else:
+            run_id, done = store.start_run(options), {}
+        plotting.enabled = not options.no_plots
+        names = list(BACKENDS) if options.backend == "all" else [options.backend]
+
+        interval = options.profile_sample / 1000 if options.profile_sample else None
+        profile = options.profile
+        if profile and options.workload in profiler.UNPROFILED:
+            print(f"--profile cannot see the driver calls of {options.workload}; running it unprofiled")
+            profile = False
+        with profiler.profiling(profile, interval) as prof:
+            if isinstance(workload, ScheduledWorkload):
+                # every backend stays open so the scheduler can interleave their cells
+                backends = []
+                try:
+                    for name in names:
+                        backends.append(get_backend(name, options))
+                    store.set_versions(run_id, {b.name: server_version(b) for b in backends})
+                    output = workload.run(backends, options, done,
+                                          record=lambda key, rep, metrics: store.add_sample(run_id, key, rep, metrics))
+                except BaseException:
+                    print(f"\nRun {run_id} stopped; finished cells are saved. Continue with:\n"
+                          f"  python -m benchmark {options.workload} --resume {run_id}")
+                    raise
+                finally:
+                    for backend in backends:
+                        backend.close()
+                results = output["results"]
+                if prof:
+                    for backend in backends:
+                        results[backend.name] = profiler.attach(prof, backend, options.workload,
+                                                                results[backend.name])
+                store.add_stats(run_id, output["stats"])
+                store_plans(store, run_id, results)
+                store.finish_run(run_id, results)
+            else:
+                results, versions = {}, {}
+                is_async = options.workload in ASYNC_WORKLOADS
+                for name in names:
+                    backend = get_async_backend(name, options) if is_async else get_backend(name, options)
+                    try:
+                        with profiler.section(name, options.workload):
+                            results[name] = workload(backend, options)
+                        versions[name] = server_version(backend)
+                        store.set_versions(run_id, versions)
+                    finally:
+                        if not is_async:
+                            backend.close()
+                    if prof:
+                        results[name] = profiler.attach(prof, backend, options.workload, results[name])
+                store_plans(store, run_id, results)
+                store.finish_run(run_id, results)
+        print(f"Recorded run {run_id} in {store.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import importlib
+
+# backend name -> "module:class", imported lazily so a MongoDB-only run
+# does not need psycopg2 installed (and vice versa)
+BACKENDS = {
+    "mongodb": "benchmark.backends.mongodb:MongoBackend",
+    "cockroachdb": "benchmark.backends.cockroachdb:CockroachBackend",
+}
+
+# asyncio drivers (Motor / asyncpg) for the shared query set
+ASYNC_BACKENDS = {
+    "mongodb": "benchmark.backends.async_mongodb:AsyncMongoBackend",
+    "cockroachdb": "benchmark.backends.async_cockroachdb:AsyncCockroachBackend",
+}
+
+
+def load_class(path):
+    module, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module), attr)
+
+
+def get_backend(name, options=None, **kwargs):
+    """Instantiate the backend registered under name, configure it from options and connect."""
+    backend = load_class(BACKENDS[name])(**kwargs)
+    if options is not None:
+        backend.configure(options)
+    backend.connect()
+    return backend
+
+
+def get_async_backend(name, options=None, **kwargs):
+    """Instantiate the asyncio backend registered under name; await connect() before use."""
+    backend = load_class(ASYNC_BACKENDS[name])(**kwargs)
+    if options is not None:
+        backend.configure(options)
+    return backend
@@ -0,0 +1,51 @@
+import re
+import time
+
+import asyncpg
+
+from benchmark import config
+from benchmark.backends.base import PoolAccounting
+from benchmark.backends.cockroachdb import QUERIES, UPDATES, CockroachBackend
+
+
+def dollar_params(sql):
+    """Rewrite psycopg2 %s placeholders as asyncpg $1, $2, ..."""
+    counter = iter(range(1, sql.count("%s") + 1))
+    return re.sub(r"%s", lambda _: f"${next(counter)}", sql)
+
+
+class AsyncCockroachBackend(PoolAccounting):
+    """asyncpg counterpart of CockroachBackend for the shared query set."""
+
+    name = CockroachBackend.name
+    label = CockroachBackend.label
+    images_dir = CockroachBackend.images_dir
+
+    def __init__(self, dsn=config.CRDB_DSN):
+        super().__init__()
+        self.dsn = dsn
+        self.pool = None
+        # read on connect(), since the driver can only answer from the event loop
+        self.version = None
+
+    def configure(self, options):
+        self.configure_pool(options)
+
+    async def connect(self):
+        self.pool = await asyncpg.create_pool(self.dsn, min_size=self.pool_min, max_size=self.pool_max)
+        self.version = await self.pool.fetchval("SELECT version()")
+
+    async def close(self):
+        await self.pool.close()
+
+    def server_version(self):
+        return self.version
+
+    async def run_query(self, name):
+        t0 = time.perf_counter_ns()
+        async with self.pool.acquire() as conn:
+            self.record_pool_wait(time.perf_counter_ns() - t0)
+            if name in UPDATES:
+                sql, params = UPDATES[name]
+                return await conn.execute(dollar_params(sql.format(table=config.SOURCE)), *params)
+            return await conn.fetch(QUERIES[name].format(table=config.SOURCE))
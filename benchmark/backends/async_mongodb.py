@@ -0,0 +1,46 @@
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from benchmark import config
+from benchmark.backends.base import PoolAccounting
+from benchmark.backends.mongodb import QUERIES, UPDATES, MongoBackend, PoolWaitListener
+
+
+class AsyncMongoBackend(PoolAccounting):
+    """Motor counterpart of MongoBackend for the shared query set."""
+
+    name = MongoBackend.name
+    label = MongoBackend.label
+    images_dir = MongoBackend.images_dir
+
+    def __init__(self, uri=config.MONGO_URI, db_name=config.MONGO_DB):
+        super().__init__()
+        self.uri = uri
+        self.db_name = db_name
+        self.client = None
+        # read on connect(), since the driver can only answer from the event loop
+        self.version = None
+
+    def configure(self, options):
+        self.configure_pool(options)
+
+    async def connect(self):
+        self.client = AsyncIOMotorClient(
+            self.uri,
+            minPoolSize=self.pool_min,
+            maxPoolSize=self.pool_max,
+            event_listeners=[PoolWaitListener(self)],
+        )
+        self.source = self.client[self.db_name][config.SOURCE]
+        self.version = f"MongoDB {(await self.client.server_info())['version']}"
+
+    async def close(self):
+        self.client.close()
+
+    def server_version(self):
+        return self.version
+
+    async def run_query(self, name):
+        if name in UPDATES:
+            flt, update = UPDATES[name]
+            return await self.source.update_many(flt, update)
+        return await self.source.find(QUERIES[name]).to_list(None)
@@ -0,0 +1,308 @@
+import threading
+from contextlib import contextmanager
+
+from benchmark.histogram import Histogram
+
+# names of the shared query set, in the order the concurrent workload submits them
+QUERY_NAMES = (
+    "query_rating_5",
+    "query_asin_equals_parent",
+    "query_verified_and_helpful",
+    "update_user_verified_false",
+    "query_cute_word",
+)
+
+# read-only members of QUERY_NAMES
+READ_QUERY_NAMES = tuple(n for n in QUERY_NAMES if n.startswith("query_"))
+
+# constraint scenarios understood by Backend.reset()
+CONSTRAINTS = ("unique", "check", "not_null")
+
+# default connection pool bounds, shared by every driver
+POOL_MIN = 1
+POOL_MAX = 100
+
+
+class TransactionConflict(Exception):
+    """A transaction lost a write conflict and may succeed if retried."""
+
+
+def batches(items, batch_size=None):
+    """Split a list into consecutive slices of batch_size (one slice when None)."""
+    if not batch_size:
+        return [items] if items else []
+    return [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+
+class PoolAccounting:
+    """Pool bounds and pool wait histogram, shared by the sync and asyncio backends."""
+
+    def __init__(self):
+        self.pool_min = POOL_MIN
+        self.pool_max = POOL_MAX
+        # time spent waiting for a pooled connection, kept apart from query time
+        self.pool_wait = Histogram()
+        self.pool_wait_lock = threading.Lock()
+
+    def configure_pool(self, options):
+        # an explicit --pool-min 0 is a valid setting, so only a missing option keeps the default
+        pool_min = getattr(options, "pool_min", None)
+        pool_max = getattr(options, "pool_max", None)
+        if pool_min is not None:
+            self.pool_min = pool_min
+        if pool_max is not None:
+            self.pool_max = pool_max
+
+    def record_pool_wait(self, ns):
+        with self.pool_wait_lock:
+            self.pool_wait.record(ns)
+
+    def take_pool_wait(self):
+        """Return the pool wait histogram collected so far and start a new one."""
+        with self.pool_wait_lock:
+            h, self.pool_wait = self.pool_wait, Histogram()
+        return h
+
+
+class Backend(PoolAccounting):
+    """Adapter interface every workload is written against.
+
+    A backend owns one connection for the sequential workload steps, a pool
+    of connections (min/max from configure()) for run_query() calls made from
+    many threads, and one work collection/table (``target``) selected with
+    use(). Connections are opened by connect(); get_backend() does
+    configure() + connect() in that order. Records are passed around as dicts keyed by
+    config.FIELDS; prepare() turns them into whatever the driver wants so that
+    conversion cost stays out of the timed region.
+    """
+
+    name = None         # command line name
+    label = None        # name used in plot titles
+    images_dir = None   # folder the plots are written to
+    unit = "Records"    # "Documents" / "Rows" in plot labels
+
+    # local process names of the database server, for psutil sampling
+    server_process_names = ()
+
+    # bulk insert strategies this backend supports; the first one is the default
+    INSERT_STRATEGIES = ("insert_many",)
+
+    # how insert_one/update_one/delete_one send their statements: "text" builds
+    # and sends the full statement per call, "prepared" reuses a statement
+    # (CockroachDB) or a pre-encoded command part (MongoDB) across calls
+    STATEMENT_MODES = ("text", "prepared")
+
+    # durability / read consistency levels accepted by set_consistency();
+    # "default" keeps the driver and server defaults
+    CONSISTENCY_LEVELS = ("default",)
+    # the subset of CONSISTENCY_LEVELS that only changes how reads are served
+    READ_ONLY_LEVELS = ()
+
+    def __init__(self):
+        super().__init__()
+        self.target = None
+        self.options = None
+        self.insert_strategy = self.INSERT_STRATEGIES[0]
+        self.statement_mode = self.STATEMENT_MODES[0]
+        self.consistency = "default"
+
+    def configure(self, options):
+        """Apply command line options (insert strategy, pool size, ...) before connect()."""
+        self.options = options
+        strategy = getattr(options, "insert_strategy", None)
+        if strategy in self.INSERT_STRATEGIES:
+            self.insert_strategy = strategy
+        self.configure_pool(options)
+
+    def connect(self):
+        raise NotImplementedError
+
+    def spawn(self):
+        """Open another connection configured like this one, e.g. for a worker thread."""
+        other = type(self)()
+        if self.options is not None:
+            other.configure(self.options)
+        other.connect()
+        return other
+
+    def set_consistency(self, level):
+        """Switch writes and reads on every connection to one of CONSISTENCY_LEVELS."""
+        if level not in self.CONSISTENCY_LEVELS:
+            raise ValueError(f"{self.label} has no consistency level {level!r}")
+        self.consistency = level
+
+    @contextmanager
+    def at_consistency(self, level):
+        """Run the block at a consistency level, then restore the previous one."""
+        previous = self.consistency
+        self.set_consistency(level)
+        try:
+            yield
+        finally:
+            self.set_consistency(previous)
+
+    def consistency_levels(self, requested, writes=False):
+        """The requested levels this backend supports, in order; the rest are reported and skipped.
+
+        With writes, the workload only writes and READ_ONLY_LEVELS are skipped too.
+        """
+        levels = [level for level in requested if level in self.CONSISTENCY_LEVELS]
+        skipped = [level for level in requested if level not in self.CONSISTENCY_LEVELS]
+        if skipped:
+            print(f"{self.label}: skipping consistency level(s) {', '.join(skipped)}")
+        if writes:
+            read_only = [level for level in levels if level in self.READ_ONLY_LEVELS]
+            if read_only:
+                print(f"{self.label}: skipping read-only consistency level(s) {', '.join(read_only)}"
+                      " for a write workload")
+            levels = [level for level in levels if level not in self.READ_ONLY_LEVELS]
+        return levels
+
+    def reuses_records(self):
+        """Whether prepare() output survives insert_many()/insert_one() unchanged, so it can be inserted again."""
+        return True
+
+    def insert_label(self):
+        """Plot label for bulk inserts, naming the strategy when it is not the default."""
+        if self.insert_strategy == self.INSERT_STRATEGIES[0]:
+            return "Insert"
+        return f"Insert ({self.insert_strategy})"
+
+    def use(self, target):
+        """Select the work collection/table the following calls operate on."""
+        self.target = target
+
+    def close(self):
+        raise NotImplementedError
+
+    # schema
+    def reset(self, constraint=None):
+        """Drop and recreate the target, optionally with one of CONSTRAINTS."""
+        raise NotImplementedError
+
+    def drop(self):
+        raise NotImplementedError
+
+    def create_index(self, field, unique=False):
+        raise NotImplementedError
+
+    def drop_indexes(self):
+        raise NotImplementedError
+
+    # writes
+    def prepare(self, docs):
+        """Convert docs to the driver's native form before timing starts."""
+        return docs
+
+    def insert_many(self, records, batch_size=None):
+        """Bulk insert; batch_size rows per statement/command, None for the backend default."""
+        raise NotImplementedError
+
+    def prepare_single(self, changes):
+        """Set up the "prepared" statement mode before timing starts.
+
+        Later update_one() calls must pass the same changes.
+        """
+        raise NotImplementedError
+
+    def insert_one(self, record):
+        raise NotImplementedError
+
+    def update_all(self, changes):
+        raise NotImplementedError
+
+    def update_one(self, key, changes):
+        raise NotImplementedError
+
+    def update_where(self, field, value, changes):
+        raise NotImplementedError
+
+    def update_batch(self, updates, batch_size=None):
+        """Apply per-record changes [(key, {field: value}), ...], batch_size records per round trip.
+
+        Every change dict must have the same fields. None sends everything at once.
+        """
+        raise NotImplementedError
+
+    def delete_all(self):
+        raise NotImplementedError
+
+    def delete_batch(self, keys, batch_size=None):
+        """Delete the given keys, batch_size keys per round trip (None: all at once)."""
+        raise NotImplementedError
+
+    def delete_one(self, key):
+        raise NotImplementedError
+
+    def transaction(self, keys):
+        """Read-modify-write helpful_vote of every key inside one multi-statement transaction.
+
+        Safe to call from many threads. Raises TransactionConflict when the
+        database aborts the transaction for a retryable conflict.
+        """
+        raise NotImplementedError
+
+    # reads
+    def keys(self):
+        """Return the primary keys of every record in the target."""
+        raise NotImplementedError
+
+    def count(self, where=None):
+        """Records in the target matching {field: value} (all records without where); 0 if it does not exist."""
+        raise NotImplementedError
+
+    def run_query(self, name):
+        """Run one of QUERY_NAMES against the source data."""
+        raise NotImplementedError
+
+    def iter_query(self, name, batch_size=None):
+        """Yield the records of a read query from QUERY_NAMES.
+
+        With batch_size the result is streamed from a server-side cursor
+        batch_size records at a time; without it the whole result is
+        materialized first, like run_query().
+        """
+        raise NotImplementedError
+
+    def server_metrics(self):
+        """Server-side resource gauges: {"memory": {label: MB}, "cpu": {label: %}}.
+
+        Called from a sampling thread while the workload runs, so it must not
+        use the dedicated connection.
+        """
+        return {}
+
+    def server_version(self):
+        """Server version string, stored with each run's results."""
+        raise NotImplementedError
+
+    def explain(self, name):
+        """Execute one of QUERY_NAMES under the server's plan profiler; returns a benchmark.plans summary."""
+        raise NotImplementedError
+
+    def explain_update_where(self, field, value, changes):
+        """Plan summary of update_where() on the target, with its writes discarded."""
+        raise NotImplementedError
+
+    def query_functions(self, names=None):
+        """Return the shared query set (or the named subset) as zero-argument callables."""
+        return [lambda name=name: self.run_query(name) for name in names or QUERY_NAMES]
+
+    # setup
+    def clone_source(self, n, changes=None):
+        """Recreate the target as a copy of the first n source records, with changes set on every copy."""
+        raise NotImplementedError
+
+    def append_source(self, n, changes=None):
+        """Append the next n source records, in key order, after the last one the target holds.
+
+        changes are set on every appended record, as in clone_source().
+
+        Appended records keep their source key, so a target built only by
+        append_source() is always a prefix of the source.
+        """
+        raise NotImplementedError
+
+    def mark_first(self, k, changes, offset=0):
+        """Apply changes to k records of the target in key order, skipping the first offset."""
+        raise NotImplementedError
@@ -0,0 +1,610 @@
+import io
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+import psycopg2
+import psycopg2.extensions
+from psycopg2.errors import SerializationFailure, UndefinedTable
+from psycopg2.extras import execute_batch, execute_values
+from psycopg2.pool import ThreadedConnectionPool
+
+from benchmark import config, profiler
+from benchmark.backends.base import Backend, TransactionConflict, batches
+from benchmark.data import as_row
+
+COLUMNS = ", ".join(config.FIELDS)
+
+# column types, in config.FIELDS order
+COLUMN_TYPES = ("INT", "STRING", "STRING", "STRING", "STRING", "STRING", "STRING", "INT", "BOOL")
+
+# extra table constraints for Backend.reset()
+TABLE_CONSTRAINTS = {
+    "unique": "CONSTRAINT {table}_user_id_key UNIQUE (user_id)",
+    "check": "CONSTRAINT {table}_rating_1_5 CHECK (rating BETWEEN 1 AND 5)",
+}
+
+QUERIES = {
+    "query_rating_5": "SELECT * FROM {table} WHERE rating = 5",
+    "query_asin_equals_parent": "SELECT * FROM {table} WHERE asin = parent_asin",
+    "query_verified_and_helpful": "SELECT * FROM {table} WHERE verified_purchase = TRUE AND helpful_vote > 2",
+    "query_cute_word": """
+        SELECT * FROM {table}
+        WHERE LOWER(title) LIKE '%cute%'
+        OR LOWER(text) LIKE '%cute%'
+    """,
+}
+
+UPDATES = {
+    "update_user_verified_false": (
+        "UPDATE {table} SET verified_purchase = FALSE WHERE user_id = %s",
+        (config.TARGET_USER,),
+    ),
+}
+
+# consistency level -> (default_transaction_isolation, AS OF SYSTEM TIME for reads or None)
+CONSISTENCY = {
+    "default": ("serializable", None),
+    "serializable": ("serializable", None),
+    # needs SET CLUSTER SETTING sql.txn.read_committed_isolation.enabled = true,
+    # otherwise CockroachDB silently runs it as SERIALIZABLE
+    "read_committed": ("read committed", None),
+    "follower_read": ("serializable", "follower_read_timestamp()"),
+    "stale_10s": ("serializable", "'-10s'"),
+}
+
+# EXPLAIN ANALYZE output; older releases say "read" where newer ones say "decoded"
+ROWS_READ = re.compile(r"rows (?:read|decoded) from KV: ([\d,]+)")
+EXECUTION_TIME = re.compile(r"execution time: ([\d.]+)(µs|ms|s)\b")
+ACTUAL_ROWS = re.compile(r"actual row count: ([\d,]+)")
+OPERATOR = re.compile(r"• (.+)$")
+TABLE_INDEX = re.compile(r"table: \S+@(\S+)")
+TIME_UNITS = {"µs": 1e-3, "ms": 1, "s": 1e3}
+
+
+def summarize_explain(lines):
+    """EXPLAIN ANALYZE output lines -> plan summary, see benchmark.plans."""
+    text = "\n".join(lines)
+    operators = [m.group(1).strip() for m in map(OPERATOR.search, lines) if m]
+    rows_read = ROWS_READ.search(text)
+    elapsed = EXECUTION_TIME.search(text)
+    # the first row count after the header belongs to the root operator
+    returned = ACTUAL_ROWS.search(text)
+    return {
+        "plan": operators,
+        "indexes": list(dict.fromkeys(TABLE_INDEX.findall(text))),
+        "full_scan": "FULL SCAN" in text,
+        "keys_examined": None,
+        "docs_examined": None,
+        "rows_read": int(rows_read.group(1).replace(",", "")) if rows_read else None,
+        "returned": int(returned.group(1).replace(",", "")) if returned else None,
+        "time_ms": float(elapsed.group(1)) * TIME_UNITS[elapsed.group(2)] if elapsed else None,
+        "raw": text,
+    }
+
+
+def select_list(changes=None):
+    """COLUMNS as an INSERT ... SELECT list with a placeholder for every changed column, and the values."""
+    changes = changes or {}
+    columns = ", ".join("%s" if f in changes else f for f in config.FIELDS)
+    return columns, [changes[f] for f in config.FIELDS if f in changes]
+
+
+# rows per multi-row INSERT when no batch size is given
+PAGE_SIZE = 1000
+
+MB = 1024 * 1024
+
+# crdb_internal.node_metrics name -> (group, label, scale)
+NODE_METRICS = {
+    "sys.rss": ("memory", "Node RSS", 1 / MB),
+    "sys.go.allocbytes": ("memory", "Go heap", 1 / MB),
+    "sys.cgo.allocbytes": ("memory", "CGo alloc", 1 / MB),
+    "rocksdb.block.cache.usage": ("memory", "Block cache", 1 / MB),
+    "sys.cpu.combined.percent-normalized": ("cpu", "Node CPU", 100),
+}
+
+
+def copy_value(v):
+    """Render one value in COPY text format."""
+    if v is None:
+        return r"\N"
+    if isinstance(v, bool):
+        return "t" if v else "f"
+    return (
+        str(v)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class CopyStream(io.TextIOBase):
+    """Read-only file object that renders rows as COPY text lines on demand.
+
+    copy_expert() pulls a few KB at a time, so only the current block of
+    lines is ever held in memory, never the whole payload.
+    """
+
+    def __init__(self, rows):
+        self.rows = iter(rows)
+        self.buf = ""
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        lines = [self.buf]
+        n = len(self.buf)
+        while size < 0 or n < size:
+            row = next(self.rows, None)
+            if row is None:
+                break
+            line = "\t".join(copy_value(v) for v in row) + "\n"
+            lines.append(line)
+            n += len(line)
+        data = "".join(lines)
+        if size < 0:
+            self.buf = ""
+            return data
+        self.buf = data[size:]
+        return data[:size]
+
+
+class TimedCursor(psycopg2.extensions.cursor):
+    """Cursor that splits each statement into encode, network, server and decode time for --profile.
+
+    Parameters are bound client-side by mogrify (encode), the bound statement
+    is sent and answered (network + server), and rows are typecast as they are
+    fetched (decode). On autocommit connections the server's own service
+    latency comes from SHOW LAST QUERY STATISTICS on a second cursor; that
+    extra round trip is recorded as overhead and left out of the wall time.
+    Inside an explicit transaction it is skipped, since a failing statement
+    there would abort the transaction.
+    """
+
+    # cleared for good when the server does not support the statement
+    server_stats = True
+
+    def mogrify(self, query, vars=None):
+        t0 = time.perf_counter_ns()
+        try:
+            return super().mogrify(query, vars)
+        finally:
+            profiler.record("encode", time.perf_counter_ns() - t0)
+
+    def execute(self, query, vars=None):
+        if vars is not None:
+            query = self.mogrify(query, vars)
+        t0 = time.perf_counter_ns()
+        super().execute(query)
+        elapsed = time.perf_counter_ns() - t0
+        server = self.service_latency() if self.name is None and self.connection.autocommit else None
+        if server is None:
+            profiler.record("network + server", elapsed)
+        else:
+            server = min(server, elapsed)
+            profiler.record("server", server)
+            profiler.record("network", elapsed - server)
+
+    def executemany(self, query, vars_list):
+        # psycopg2 binds executemany parameters in C; one execute per row keeps them visible
+        for vars in vars_list:
+            self.execute(query, vars)
+
+    def copy_expert(self, sql, file, size=8192):
+        # COPY streams the client-side encoding and the server round trips together
+        t0 = time.perf_counter_ns()
+        try:
+            return super().copy_expert(sql, file, size)
+        finally:
+            profiler.record("network + server", time.perf_counter_ns() - t0)
+
+    def service_latency(self):
+        """Server-side latency (ns) of the statement just executed, or None."""
+        if not TimedCursor.server_stats:
+            return None
+        t0 = time.perf_counter_ns()
+        try:
+            with self.connection.cursor(cursor_factory=psycopg2.extensions.cursor) as cur:
+                cur.execute("SHOW LAST QUERY STATISTICS")
+                row = dict(zip([c.name for c in cur.description], cur.fetchone()))
+            return row["service_latency"].total_seconds() * 1e9
+        except (psycopg2.Error, KeyError, TypeError):
+            TimedCursor.server_stats = False
+            return None
+        finally:
+            profiler.record("overhead", time.perf_counter_ns() - t0)
+
+    def fetched(self, fetch, *args):
+        t0 = time.perf_counter_ns()
+        try:
+            return fetch(*args)
+        finally:
+            # a named cursor fetches from the server; a client-side one only typecasts
+            category = "decode" if self.name is None else "network + server"
+            profiler.record(category, time.perf_counter_ns() - t0)
+
+    def fetchone(self):
+        return self.fetched(super().fetchone)
+
+    def fetchmany(self, size=None):
+        return self.fetched(super().fetchmany, self.arraysize if size is None else size)
+
+    def fetchall(self):
+        return self.fetched(super().fetchall)
+
+
+class BlockingPool(ThreadedConnectionPool):
+    """ThreadedConnectionPool that waits for a free connection instead of raising PoolError."""
+
+    def __init__(self, minconn, maxconn, *args, **kwargs):
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        self.slots = threading.BoundedSemaphore(maxconn)
+
+    def getconn(self, key=None):
+        self.slots.acquire()
+        try:
+            return super().getconn(key)
+        except Exception:
+            self.slots.release()
+            raise
+
+    def putconn(self, conn, key=None, close=False):
+        super().putconn(conn, key, close)
+        self.slots.release()
+
+
+class CockroachBackend(Backend):
+    name = "cockroachdb"
+    label = "CockroachDB"
+    images_dir = "CockroachDB_Images"
+    unit = "Rows"
+    server_process_names = ("cockroach", "cockroach.exe")
+
+    # values: multi-row INSERT via execute_values, executemany: one INSERT per row,
+    # copy: COPY FROM STDIN streamed from CopyStream
+    INSERT_STRATEGIES = ("values", "executemany", "copy")
+    CONSISTENCY_LEVELS = tuple(CONSISTENCY)
+    READ_ONLY_LEVELS = ("follower_read", "stale_10s")
+
+    def __init__(self, dsn=config.CRDB_DSN):
+        super().__init__()
+        self.dsn = dsn
+        # operation -> EXECUTE text of the statement PREPAREd for it on the dedicated connection
+        self.statements = {}
+        # id(pooled connection) -> consistency level its session is set to
+        self.session_levels = {}
+
+    def connect(self):
+        # dedicated connection for the sequential workload steps
+        extra = {"cursor_factory": TimedCursor} if profiler.active() else {}
+        self.conn = psycopg2.connect(self.dsn, **extra)
+        self.conn.autocommit = True
+        self.cur = self.conn.cursor()
+        # a psycopg2 connection serializes its cursors, so anything that runs
+        # from several threads checks out its own connection from the pool
+        self.pool = BlockingPool(self.pool_min, self.pool_max, self.dsn, **extra)
+        self.set_consistency(self.consistency)
+
+    def set_consistency(self, level):
+        super().set_consistency(level)
+        self.apply_session(self.cur)
+        # pooled connections catch up on their next checkout
+        self.session_levels.clear()
+
+    def apply_session(self, cur):
+        isolation, _ = CONSISTENCY[self.consistency]
+        cur.execute(f"SET default_transaction_isolation = '{isolation}'")
+
+    def read_source(self):
+        """Source table reference for SELECTs, with AS OF SYSTEM TIME when the level asks for it."""
+        _, as_of = CONSISTENCY[self.consistency]
+        return config.SOURCE if as_of is None else f"{config.SOURCE} AS OF SYSTEM TIME {as_of}"
+
+    def close(self):
+        self.cur.close()
+        self.conn.close()
+        self.pool.closeall()
+
+    @contextmanager
+    def pooled(self, autocommit=True):
+        """Check out a pooled connection, recording the wait."""
+        t0 = time.perf_counter_ns()
+        conn = self.pool.getconn()
+        self.record_pool_wait(time.perf_counter_ns() - t0)
+        try:
+            conn.autocommit = True
+            if self.session_levels.get(id(conn)) != self.consistency:
+                with conn.cursor() as cur:
+                    self.apply_session(cur)
+                self.session_levels[id(conn)] = self.consistency
+            conn.autocommit = autocommit
+            yield conn
+        finally:
+            self.pool.putconn(conn)
+
+    # schema
+    def reset(self, constraint=None):
+        nn = " NOT NULL" if constraint == "not_null" else ""
+        columns = [f"{f} {t}{nn}" for f, t in zip(config.FIELDS, COLUMN_TYPES)]
+        if constraint in TABLE_CONSTRAINTS:
+            columns.append(TABLE_CONSTRAINTS[constraint].format(table=self.target))
+        self.drop()
+        self.cur.execute(f"""
+            CREATE TABLE {self.target} (
+                id INT PRIMARY KEY DEFAULT unique_rowid(),
+                {", ".join(columns)}
+            )
+        """)
+
+    def use(self, target):
+        self.deallocate()
+        super().use(target)
+
+    def drop(self):
+        # prepared plans refer to the table being dropped
+        self.deallocate()
+        self.cur.execute(f"DROP TABLE IF EXISTS {self.target}")
+
+    def create_index(self, field, unique=False):
+        kind = "UNIQUE INDEX" if unique else "INDEX"
+        self.cur.execute(
+            f"CREATE {kind} IF NOT EXISTS {self.target}_{field}_idx ON {self.target} ({field})"
+        )
+
+    def drop_indexes(self):
+        # CockroachDB does not support IF EXISTS on DROP INDEX, so we must check manually
+        self.cur.execute(f"""
+            SELECT DISTINCT index_name
+            FROM [SHOW INDEXES FROM {self.target}]
+            WHERE index_name != '{self.target}_pkey'
+        """)
+        for (index_name,) in self.cur.fetchall():
+            self.cur.execute(f"DROP INDEX {self.target}@{index_name} CASCADE")
+
+    # writes
+    def prepare(self, docs):
+        return [as_row(d) for d in docs]
+
+    def insert_many(self, records, batch_size=None):
+        if self.insert_strategy == "copy":
+            # one COPY per batch; the whole list streams through a single COPY by default
+            for batch in batches(records, batch_size):
+                self.cur.copy_expert(
+                    f"COPY {self.target} ({COLUMNS}) FROM STDIN", CopyStream(batch)
+                )
+        elif self.insert_strategy == "executemany":
+            if batch_size is None:
+                self.cur.executemany(self.insert_sql(), records)
+            else:
+                # batch_size single-row INSERTs per round trip
+                execute_batch(self.cur, self.insert_sql(), records, page_size=batch_size)
+        else:
+            execute_values(
+                self.cur,
+                f"INSERT INTO {self.target} ({COLUMNS}) VALUES %s",
+                records,
+                page_size=batch_size or PAGE_SIZE,
+            )
+
+    def insert_sql(self):
+        return f"INSERT INTO {self.target} ({COLUMNS}) VALUES ({', '.join(['%s'] * len(config.FIELDS))})"
+
+    def prepare_statement(self, name, types, sql):
+        """PREPARE sql on the dedicated connection and keep the EXECUTE text that runs it."""
+        self.cur.execute(f"PREPARE {name} ({', '.join(types)}) AS {sql}")
+        self.statements[name] = f"EXECUTE {name} ({', '.join(['%s'] * len(types))})"
+
+    def prepare_single(self, changes):
+        self.deallocate()
+        types = dict(zip(config.FIELDS, COLUMN_TYPES))
+        values = ", ".join(f"${i}" for i in range(1, len(config.FIELDS) + 1))
+        self.prepare_statement("insert_one", COLUMN_TYPES,
+                               f"INSERT INTO {self.target} ({COLUMNS}) VALUES ({values})")
+        sets = ", ".join(f"{f} = ${i}" for i, f in enumerate(changes, 1))
+        self.prepare_statement("update_one", [types[f] for f in changes] + ["INT"],
+                               f"UPDATE {self.target} SET {sets} WHERE id = ${len(changes) + 1}")
+        self.prepare_statement("delete_one", ["INT"], f"DELETE FROM {self.target} WHERE id = $1")
+
+    def deallocate(self):
+        if self.statements:
+            self.cur.execute("DEALLOCATE ALL")
+            self.statements.clear()
+
+    def insert_one(self, record):
+        if self.statement_mode == "prepared":
+            self.cur.execute(self.statements["insert_one"], record)
+        else:
+            self.cur.execute(self.insert_sql(), record)
+
+    def update_all(self, changes):
+        sets = ", ".join(f"{f} = %s" for f in changes)
+        self.cur.execute(f"UPDATE {self.target} SET {sets}", tuple(changes.values()))
+
+    def update_one(self, key, changes):
+        if self.statement_mode == "prepared":
+            self.cur.execute(self.statements["update_one"], (*changes.values(), key))
+            return
+        sets = ", ".join(f"{f} = %s" for f in changes)
+        self.cur.execute(
+            f"UPDATE {self.target} SET {sets} WHERE id = %s", (*changes.values(), key)
+        )
+
+    def update_where(self, field, value, changes):
+        sets = ", ".join(f"{f} = %s" for f in changes)
+        self.cur.execute(
+            f"UPDATE {self.target} SET {sets} WHERE {field} = %s", (*changes.values(), value)
+        )
+
+    def update_batch(self, updates, batch_size=None):
+        if not updates:
+            return
+        fields = list(updates[0][1])
+        types = dict(zip(config.FIELDS, COLUMN_TYPES))
+        sets = ", ".join(f"{f} = v.{f}" for f in fields)
+        template = "(" + ", ".join(["%s::INT"] + [f"%s::{types[f]}" for f in fields]) + ")"
+        execute_values(
+            self.cur,
+            f"UPDATE {self.target} SET {sets} FROM (VALUES %s) AS v (id, {', '.join(fields)})"
+            f" WHERE {self.target}.id = v.id",
+            [(k, *c.values()) for k, c in updates],
+            template=template,
+            page_size=batch_size or len(updates),
+        )
+
+    def delete_all(self):
+        self.cur.execute(f"DELETE FROM {self.target}")
+
+    def delete_batch(self, keys, batch_size=None):
+        for batch in batches(keys, batch_size):
+            self.cur.execute(f"DELETE FROM {self.target} WHERE id = ANY(%s)", (batch,))
+
+    def delete_one(self, key):
+        if self.statement_mode == "prepared":
+            self.cur.execute(self.statements["delete_one"], (key,))
+        else:
+            self.cur.execute(f"DELETE FROM {self.target} WHERE id = %s", (key,))
+
+    def transaction(self, keys):
+        with self.pooled(autocommit=False) as conn:
+            try:
+                with conn.cursor() as cur:
+                    for key in keys:
+                        cur.execute(f"SELECT helpful_vote FROM {self.target} WHERE id = %s", (key,))
+                        (votes,) = cur.fetchone()
+                        cur.execute(f"UPDATE {self.target} SET helpful_vote = %s WHERE id = %s",
+                                    (votes + 1, key))
+                conn.commit()
+            except SerializationFailure as exc:
+                # SQLSTATE 40001: SERIALIZABLE conflict, the client is expected to retry
+                conn.rollback()
+                raise TransactionConflict(exc.pgerror) from exc
+            except Exception:
+                conn.rollback()
+                raise
+
+    # reads
+    def keys(self):
+        self.cur.execute(f"SELECT id FROM {self.target}")
+        return [row[0] for row in self.cur.fetchall()]
+
+    def count(self, where=None):
+        where = where or {}
+        sql = f"SELECT count(*) FROM {self.target}"
+        if where:
+            sql += " WHERE " + " AND ".join(f"{f} = %s" for f in where)
+        try:
+            self.cur.execute(sql, tuple(where.values()))
+        except UndefinedTable:
+            return 0
+        return self.cur.fetchone()[0]
+
+    def run_query(self, name):
+        with self.pooled() as conn, conn.cursor() as cur:
+            if name in UPDATES:
+                sql, params = UPDATES[name]
+                cur.execute(sql.format(table=config.SOURCE), params)
+                return cur.rowcount
+            cur.execute(QUERIES[name].format(table=self.read_source()))
+            return cur.fetchall()
+
+    def iter_query(self, name, batch_size=None):
+        sql = QUERIES[name].format(table=self.read_source())
+        with self.pooled() as conn:
+            if batch_size is None:
+                with conn.cursor() as cur:
+                    cur.execute(sql)
+                    rows = cur.fetchall()
+                yield from rows
+                return
+            # named (server-side) cursors only live inside a transaction
+            conn.autocommit = False
+            try:
+                with conn.cursor(name=f"stream_{name}") as cur:
+                    cur.itersize = batch_size
+                    cur.execute(sql)
+                    yield from cur
+            finally:
+                conn.rollback()
+
+    def explain(self, name):
+        if name in UPDATES:
+            sql, params = UPDATES[name]
+            return self.explain_analyze(sql.format(table=config.SOURCE), params)
+        return self.explain_analyze(QUERIES[name].format(table=self.read_source()))
+
+    def explain_update_where(self, field, value, changes):
+        sets = ", ".join(f"{f} = %s" for f in changes)
+        return self.explain_analyze(
+            f"UPDATE {self.target} SET {sets} WHERE {field} = %s", (*changes.values(), value)
+        )
+
+    def explain_analyze(self, sql, params=None):
+        # EXPLAIN ANALYZE really executes the statement; writes run in a
+        # transaction that is rolled back. AS OF SYSTEM TIME reads must be
+        # top-level statements, so reads stay in autocommit.
+        writes = params is not None
+        with self.pooled(autocommit=not writes) as conn, conn.cursor() as cur:
+            try:
+                cur.execute(f"EXPLAIN ANALYZE {sql}", params)
+                lines = [row[0] for row in cur.fetchall()]
+            finally:
+                if writes:
+                    conn.rollback()
+        return summarize_explain(lines)
+
+    def server_metrics(self):
+        with self.pooled() as conn, conn.cursor() as cur:
+            cur.execute(
+                "SELECT name, value FROM crdb_internal.node_metrics WHERE name IN %s",
+                (tuple(NODE_METRICS),),
+            )
+            rows = cur.fetchall()
+        metrics = {"memory": {}, "cpu": {}}
+        for name, value in rows:
+            group, label, scale = NODE_METRICS[name]
+            # store-level metrics come once per store; add them up
+            metrics[group][label] = metrics[group].get(label, 0.0) + value * scale
+        return metrics
+
+    def server_version(self):
+        self.cur.execute("SELECT version()")
+        return self.cur.fetchone()[0]
+
+    # setup
+    def clone_source(self, n, changes=None):
+        self.reset()
+        columns, values = select_list(changes)
+        self.cur.execute(f"""
+            INSERT INTO {self.target} ({COLUMNS})
+            SELECT {columns}
+            FROM {config.SOURCE}
+            LIMIT %s
+        """, (*values, n))
+
+    def append_source(self, n, changes=None):
+        # keyset on the copied ids, so each step reads only the new rows
+        columns, values = select_list(changes)
+        self.cur.execute(f"""
+            INSERT INTO {self.target} (id, {COLUMNS})
+            SELECT id, {columns}
+            FROM {config.SOURCE}
+            WHERE id > (SELECT COALESCE(max(id), 0) FROM {self.target})
+            ORDER BY id
+            LIMIT %s
+        """, (*values, n))
+
+    def mark_first(self, k, changes, offset=0):
+        sets = ", ".join(f"{f} = %s" for f in changes)
+        self.cur.execute(f"""
+            UPDATE {self.target}
+            SET {sets}
+            WHERE id IN (
+                SELECT id FROM {self.target}
+                ORDER BY id
+                LIMIT %s OFFSET %s
+            )
+        """, (*changes.values(), k, offset))
@@ -0,0 +1,377 @@
+import json
+
+import bson
+import bson.json_util
+import pymongo
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from pymongo import monitoring
+from pymongo.errors import PyMongoError
+from pymongo.read_concern import ReadConcern
+from pymongo.write_concern import WriteConcern
+
+from benchmark import config, profiler
+from benchmark.backends.base import Backend, TransactionConflict, batches
+
+# JSON Schema validators kept next to the original MongoDB scripts
+VALIDATORS = {
+    "check": config.ROOT / "MongoDB_Code" / "validator_check_rating.json",
+    "not_null": config.ROOT / "MongoDB_Code" / "validator_notnull.json",
+}
+
+MB = 1024 * 1024
+
+# consistency level -> (write concern, read concern); None keeps the server default
+CONSISTENCY = {
+    "default": (None, None),
+    "w0": (WriteConcern(w=0), None),
+    "w1": (WriteConcern(w=1), None),
+    "journaled": (WriteConcern(w=1, j=True), None),
+    "majority": (WriteConcern(w="majority"), ReadConcern("majority")),
+    "available": (None, ReadConcern("available")),
+    "linearizable": (WriteConcern(w="majority"), ReadConcern("linearizable")),
+}
+
+# query filters
+QUERIES = {
+    "query_rating_5": {"rating": 5},
+    "query_asin_equals_parent": {"$expr": {"$eq": ["$asin", "$parent_asin"]}},
+    "query_verified_and_helpful": {"verified_purchase": True, "helpful_vote": {"$gt": 2}},
+    "query_cute_word": {
+        "$or": [
+            {"title": {"$regex": "cute", "$options": "i"}},
+            {"text": {"$regex": "cute", "$options": "i"}},
+        ]
+    },
+}
+
+# update filters and modifications
+UPDATES = {
+    "update_user_verified_false": (
+        {"user_id": config.TARGET_USER},
+        {"$set": {"verified_purchase": False}},
+    ),
+}
+
+
+def plan_stages(node):
+    """Stages of an explain plan tree, outermost first."""
+    yield node
+    for key in ("queryPlan", "inputStage"):
+        if key in node:
+            yield from plan_stages(node[key])
+    for child in node.get("inputStages", ()):
+        yield from plan_stages(child)
+
+
+def summarize_explain(out):
+    """explain(executionStats) output -> plan summary, see benchmark.plans."""
+    stats = out["executionStats"]
+    stages = list(plan_stages(out["queryPlanner"]["winningPlan"]))
+    names = [s["stage"] for s in stages if "stage" in s]
+    top = stats.get("executionStages", {})
+    return {
+        "plan": names,
+        "indexes": [s["indexName"] for s in stages if "indexName" in s],
+        "full_scan": "COLLSCAN" in names,
+        "keys_examined": stats.get("totalKeysExamined"),
+        "docs_examined": stats.get("totalDocsExamined"),
+        "rows_read": None,
+        # an update's stages return nothing; what it matched is the useful count
+        "returned": top.get("nMatched", stats.get("nReturned")),
+        "time_ms": stats.get("executionTimeMillis"),
+        "raw": json.loads(bson.json_util.dumps(out)),
+    }
+
+
+def set_stage(changes):
+    """$set stage assigning changes as literal values."""
+    return {"$set": {field: {"$literal": value} for field, value in changes.items()}}
+
+
+class PoolWaitListener(monitoring.ConnectionPoolListener):
+    """Feeds pymongo's connection checkout durations into Backend.pool_wait."""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def connection_checked_out(self, event):
+        # duration covers the whole checkout, including waiting for a free connection
+        self.backend.record_pool_wait(event.duration * 1e9)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        pass
+
+    def connection_checked_in(self, event):
+        pass
+
+
+class CommandTimer(monitoring.CommandListener):
+    """Feeds pymongo's per-command round trip into the --profile cost breakdown.
+
+    The driver measures from just before the encoded command is sent until
+    the reply has been read and unpacked, so the duration is network plus
+    server time; BSON encoding of the command happens before it starts.
+    """
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        profiler.record("network + server", event.duration_micros * 1000)
+
+    def failed(self, event):
+        profiler.record("network + server", event.duration_micros * 1000)
+
+
+class MongoBackend(Backend):
+    name = "mongodb"
+    label = "MongoDB"
+    images_dir = "MongoDB_Images"
+    unit = "Documents"
+    server_process_names = ("mongod", "mongod.exe")
+    # insert_many: dicts, encoded by the driver on every insert; raw_bson:
+    # encoded once by prepare() and sent as RawBSONDocument bytes
+    INSERT_STRATEGIES = ("insert_many", "raw_bson")
+    CONSISTENCY_LEVELS = tuple(CONSISTENCY)
+    READ_ONLY_LEVELS = ("available",)
+
+    def __init__(self, uri=config.MONGO_URI, db_name=config.MONGO_DB):
+        super().__init__()
+        self.uri = uri
+        self.db_name = db_name
+        # update document of the "prepared" statement mode, encoded by prepare_single()
+        self.prepared_update = None
+        # source queries return undecoded RawBSONDocuments
+        self.raw_reads = False
+
+    def configure(self, options):
+        super().configure(options)
+        self.raw_reads = getattr(options, "raw_reads", False)
+
+    def connect(self):
+        # MongoClient is thread-safe; its own pool serves run_query() from many threads
+        listeners = [PoolWaitListener(self)]
+        if profiler.active():
+            listeners.append(CommandTimer())
+        self.client = pymongo.MongoClient(
+            self.uri,
+            minPoolSize=self.pool_min,
+            maxPoolSize=self.pool_max,
+            event_listeners=listeners,
+        )
+        self.set_consistency(self.consistency)
+
+    def set_consistency(self, level):
+        super().set_consistency(level)
+        write_concern, read_concern = CONSISTENCY[level]
+        # every collection handle is taken from self.db, so they all inherit the concerns
+        self.db = self.client.get_database(self.db_name, write_concern=write_concern, read_concern=read_concern)
+        codec = CodecOptions(document_class=RawBSONDocument) if self.raw_reads else None
+        self.source = self.db.get_collection(config.SOURCE, codec_options=codec)
+
+    @property
+    def col(self):
+        return self.db[self.target]
+
+    def close(self):
+        self.client.close()
+
+    # schema
+    def reset(self, constraint=None):
+        self.col.drop()
+        if constraint == "unique":
+            self.create_index("user_id", unique=True)
+        elif constraint in VALIDATORS:
+            schema = json.loads(VALIDATORS[constraint].read_text())
+            self.db.create_collection(
+                self.target,
+                validator={"$jsonSchema": schema},
+                validationLevel="strict",
+                validationAction="error",
+            )
+
+    def drop(self):
+        self.col.drop()
+
+    def create_index(self, field, unique=False):
+        self.col.create_index(field, unique=unique)
+
+    def drop_indexes(self):
+        try:
+            self.col.drop_indexes()
+        except pymongo.errors.OperationFailure:
+            pass
+
+    # writes
+    def prepare(self, docs):
+        if self.insert_strategy == "raw_bson":
+            return [RawBSONDocument(bson.encode(d)) for d in docs]
+        return docs
+
+    def reuses_records(self):
+        # the driver adds an _id to every inserted dict, so a second insert of
+        # the same dicts collides; RawBSONDocuments are left alone and the
+        # server assigns their _id
+        return self.insert_strategy == "raw_bson"
+
+    def insert_many(self, records, batch_size=None):
+        for batch in batches(records, batch_size):
+            self.col.insert_many(batch, ordered=False)
+
+    def insert_one(self, record):
+        self.col.insert_one(record)
+
+    def update_all(self, changes):
+        self.col.update_many({}, {"$set": changes})
+
+    def prepare_single(self, changes):
+        # MongoDB has no server-side prepared statements; the closest reuse
+        # is sending the constant update document as pre-encoded BSON
+        self.prepared_update = RawBSONDocument(bson.encode({"$set": changes}))
+
+    def update_one(self, key, changes):
+        if self.statement_mode == "prepared":
+            self.col.update_one({"_id": key}, self.prepared_update)
+        else:
+            self.col.update_one({"_id": key}, {"$set": changes})
+
+    def update_where(self, field, value, changes):
+        self.col.update_many({field: value}, {"$set": changes})
+
+    def update_batch(self, updates, batch_size=None):
+        for batch in batches(updates, batch_size):
+            self.col.bulk_write([pymongo.UpdateOne({"_id": k}, {"$set": c}) for k, c in batch], ordered=False)
+
+    def delete_all(self):
+        self.col.delete_many({})
+
+    def delete_batch(self, keys, batch_size=None):
+        for batch in batches(keys, batch_size):
+            self.col.delete_many({"_id": {"$in": batch}})
+
+    def delete_one(self, key):
+        self.col.delete_one({"_id": key})
+
+    def transaction(self, keys):
+        # multi-document transactions need a replica set (a single-node one is enough)
+        try:
+            with self.client.start_session() as session, session.start_transaction():
+                for key in keys:
+                    doc = self.col.find_one({"_id": key}, {"helpful_vote": 1}, session=session)
+                    self.col.update_one({"_id": key}, {"$set": {"helpful_vote": doc["helpful_vote"] + 1}},
+                                        session=session)
+        except PyMongoError as exc:
+            # WriteConflict and friends carry this label; the driver expects a retry
+            if exc.has_error_label("TransientTransactionError"):
+                raise TransactionConflict(str(exc)) from exc
+            raise
+
+    # reads
+    def keys(self):
+        return [d["_id"] for d in self.col.find({}, {"_id": 1})]
+
+    def count(self, where=None):
+        return self.col.count_documents(where or {})
+
+    def run_query(self, name):
+        if name in UPDATES:
+            flt, update = UPDATES[name]
+            return self.source.update_many(flt, update)
+        return list(self.source.find(QUERIES[name]))
+
+    def iter_query(self, name, batch_size=None):
+        if batch_size is None:
+            yield from list(self.source.find(QUERIES[name]))
+        else:
+            yield from self.source.find(QUERIES[name], batch_size=batch_size)
+
+    def explain(self, name):
+        if name in UPDATES:
+            flt, update = UPDATES[name]
+            return self.explain_command(
+                {"update": self.source.name, "updates": [{"q": flt, "u": update, "multi": True}]}
+            )
+        return self.explain_command({"find": self.source.name, "filter": QUERIES[name]})
+
+    def explain_update_where(self, field, value, changes):
+        return self.explain_command(
+            {"update": self.target, "updates": [{"q": {field: value}, "u": {"$set": changes}, "multi": True}]}
+        )
+
+    def explain_command(self, command):
+        # executionStats runs the plan but never applies an update's writes
+        return summarize_explain(self.db.command("explain", command, verbosity="executionStats"))
+
+    def server_metrics(self):
+        status = self.client.admin.command("serverStatus")
+        cache = status.get("wiredTiger", {}).get("cache", {})
+        return {
+            "memory": {
+                "mongod resident": status["mem"]["resident"],  # already MB
+                "WiredTiger cache": cache.get("bytes currently in the cache", 0) / MB,
+                "WiredTiger dirty": cache.get("tracked dirty bytes in the cache", 0) / MB,
+            },
+        }
+
+    def server_version(self):
+        return f"MongoDB {self.client.server_info()['version']}"
+
+    # setup: aggregation pipelines that write with $out / $merge, so the
+    # records never travel to the client and back
+    def clone_source(self, n, changes=None):
+        self.col.drop()
+        pipeline = [{"$limit": n}, {"$project": {"_id": 0}}]
+        if changes:
+            pipeline.append(set_stage(changes))
+        self.source.aggregate([*pipeline, {"$out": self.target}])
+        if not self.col.estimated_document_count():
+            raise RuntimeError(f"No data found in {self.db.name}.{config.SOURCE}.")
+
+    def append_source(self, n, changes=None):
+        last = self.col.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+        pipeline = [
+            {"$match": {} if last is None else {"_id": {"$gt": last["_id"]}}},
+            {"$sort": {"_id": 1}},
+            {"$limit": n},
+        ]
+        if changes:
+            pipeline.append(set_stage(changes))
+        self.source.aggregate([*pipeline, {"$merge": {"into": self.target, "whenMatched": "fail"}}])
+
+    def mark_first(self, k, changes, offset=0):
+        # $merge back into the collection being read (MongoDB 4.4+)
+        pipeline = [{"$sort": {"_id": 1}}]
+        if offset:
+            pipeline.append({"$skip": offset})
+        pipeline += [
+            {"$limit": k},
+            {"$project": {"_id": 1}},
+            set_stage(changes),
+            {"$merge": {"into": self.target, "whenMatched": "merge", "whenNotMatched": "discard"}},
+        ]
+        self.col.aggregate(pipeline)
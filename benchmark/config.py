@@ -0,0 +1,35 @@
+from pathlib import Path
+
+# paths
+ROOT = Path(__file__).resolve().parent.parent
+DATASET_DIR = ROOT / "Dataset"
+RESULTS_DB = ROOT / "Results" / "results.db"
+
+# connections
+MONGO_URI = "mongodb://localhost:27017/"
+MONGO_DB = "first100k"
+CRDB_DSN = "postgresql://root@127.0.0.1:26257/defaultdb?sslmode=disable"
+
+# source data loaded by the upload scripts
+SOURCE = "user_review"
+
+# review schema, in table column order
+FIELDS = (
+    "rating",
+    "title",
+    "text",
+    "asin",
+    "parent_asin",
+    "user_id",
+    "timestamp",
+    "helpful_vote",
+    "verified_purchase",
+)
+
+# workload defaults
+SAMPLE_SIZES = list(range(10_000, 100_001, 10_000))  # 10k..100k
+CONCURRENT_COUNTS = [2, 3, 4, 5]
+ASYNC_CONCURRENCY = [1, 10, 100, 500, 1000, 2000, 5000]
+OPEN_LOOP_RATES = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000]
+TARGET_USER = "AGBFYI2DDIKXC5Y4FARTYDTQBMFQ"
+MATCH_FRACTION = 0.01
@@ -0,0 +1,89 @@
+"""Closed-loop transactional clients with a client-side retry loop.
+
+Each client thread picks `txn_keys` records per transaction: from the hot
+set with probability `hot_fraction`, otherwise from the cold remainder. It
+runs backend.transaction() and on TransactionConflict backs off
+(exponential, full jitter) and retries up to `max_retries` times before
+giving the transaction up as aborted. Latency is measured from the first
+attempt to the commit, so it includes every retry and backoff.
+"""
+import random
+import threading
+import time
+
+from benchmark import profiler
+from benchmark.backends.base import TransactionConflict
+from benchmark.histogram import Histogram
+
+# backoff before retry n: uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2**n)) seconds
+BACKOFF_BASE = 0.001
+BACKOFF_CAP = 0.1
+
+
+def backoff(attempt, rng):
+    return rng.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+def run_contention(backend, keys, hot_keys, options):
+    """Run options.threads clients for options.duration seconds against one hot set size.
+
+    Returns committed/aborted transaction counts, attempts, conflicts, errors
+    (with the first one's message), committed TPS and the latency histogram
+    (first attempt to commit).
+    """
+    hot, cold = keys[:hot_keys], keys[hot_keys:] or keys
+    latency = Histogram()
+    lock = threading.Lock()
+    totals = {"committed": 0, "aborted": 0, "attempts": 0, "conflicts": 0, "errors": 0}
+    first_error = []
+    deadline = time.perf_counter() + options.duration
+
+    def client(index):
+        rng = random.Random(options.seed + index)
+        local = dict.fromkeys(totals, 0)
+        hist = Histogram()
+        while time.perf_counter() < deadline:
+            pool = hot if rng.random() < options.hot_fraction else cold
+            txn = rng.sample(pool, min(options.txn_keys, len(pool)))
+            start = time.perf_counter_ns()
+            for attempt in range(options.max_retries + 1):
+                local["attempts"] += 1
+                try:
+                    with profiler.region():
+                        backend.transaction(txn)
+                except TransactionConflict:
+                    local["conflicts"] += 1
+                    if attempt < options.max_retries:
+                        time.sleep(backoff(attempt, rng))
+                        continue
+                    local["aborted"] += 1
+                except Exception as exc:
+                    local["errors"] += 1
+                    if not first_error:
+                        first_error.append(repr(exc))
+                else:
+                    local["committed"] += 1
+                    hist.record(time.perf_counter_ns() - start)
+                break
+        with lock:
+            latency.merge(hist)
+            for k, v in local.items():
+                totals[k] += v
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(options.threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    started = totals["committed"] + totals["aborted"]
+    return {
+        **totals,
+        "tps": totals["committed"] / elapsed,
+        "retry_rate": totals["conflicts"] / totals["attempts"] if totals["attempts"] else 0.0,
+        "abort_rate": totals["aborted"] / started if started else 0.0,
+        "latency": latency,
+        "first_error": first_error[0] if first_error else None,
+    }
@@ -0,0 +1,62 @@
+from benchmark.config import FIELDS
+
+# reuse content
+BASE_DOC = {
+    "rating": 5,
+    "title": "cute",
+    "text": "very cute",
+    "asin": "B09DQ5M2BB",
+    "parent_asin": "B09DQ5M2BB",
+    "user_id": "AFNT6ZJCYQN3WDIKUSWHJDXNND2Q",
+    "timestamp": "12:33:48 AM",
+    "helpful_vote": 3,
+    "verified_purchase": True,
+}
+
+
+def make_fixed_docs(n, unique_users=False):
+    """Generate n copies of BASE_DOC. If unique_users=True, user_id=USER1..USERn."""
+    docs = []
+    for i in range(1, n + 1):
+        doc = BASE_DOC.copy()
+        if unique_users:
+            doc["user_id"] = f"USER{i}"
+        docs.append(doc)
+    return docs
+
+
+def make_docs(n, unique_users=False, options=None):
+    """Generate n sample docs as selected by --data (synthetic unless options say fixed).
+
+    Synthetic docs come from a DocGenerator seeded with --seed, so every call
+    with the same options returns the same docs.
+    """
+    if options is not None and options.data == "fixed":
+        return make_fixed_docs(n, unique_users)
+    # imported here so the fixed mode does not need NumPy
+    from benchmark.generator import DocGenerator
+
+    if options is None:
+        return DocGenerator().docs(n, unique_users=unique_users)
+    return DocGenerator.from_options(options).docs(n, unique_users=unique_users)
+
+
+def prepared_records(backend, n, options, cache=None):
+    """backend.prepare(make_docs(n)), kept in cache while the backend can insert the same records again.
+
+    Generated docs depend only on the options, so consecutive passes of a
+    size can share one prepared list instead of generating and encoding it
+    again. The cache holds only the latest size, so memory stays bounded by
+    the largest size rather than growing with every size of the sweep.
+    """
+    if cache is None or not backend.reuses_records():
+        return backend.prepare(make_docs(n, options=options))
+    if n not in cache:
+        cache.clear()
+        cache[n] = backend.prepare(make_docs(n, options=options))
+    return cache[n]
+
+
+def as_row(doc):
+    """Return a doc as a tuple in table column order."""
+    return tuple(doc[f] for f in FIELDS)
@@ -0,0 +1,141 @@
+"""Columnar cache of the review datasets.
+
+Parsing Dataset/dtb_100,000.xlsx with openpyxl is slow and memory hungry, so
+convert() writes each source file once to an Arrow IPC file under
+Dataset/cache/, named after a hash of the source contents. Readers then
+memory-map that file and pull record batches lazily:
+
+    for docs in iter_docs("Dataset/dtb_100,000.xlsx", 5_000):
+        ...
+"""
+import hashlib
+import json
+from pathlib import Path
+
+import pyarrow as pa
+
+from benchmark import config
+
+CACHE_DIR = config.DATASET_DIR / "cache"
+INDEX = CACHE_DIR / "index.json"
+
+# source files converted by `python -m benchmark convert`
+SOURCES = (
+    config.DATASET_DIR / "dtb_100,000.xlsx",
+    config.DATASET_DIR / "unique_users_AmazonFashion.csv",
+)
+
+SCHEMA = pa.schema([
+    ("rating", pa.int64()),
+    ("title", pa.string()),
+    ("text", pa.string()),
+    ("asin", pa.string()),
+    ("parent_asin", pa.string()),
+    ("user_id", pa.string()),
+    ("timestamp", pa.string()),
+    ("helpful_vote", pa.int64()),
+    ("verified_purchase", pa.bool_()),
+])
+
+# rows per record batch written to the cache
+BATCH_ROWS = 10_000
+
+
+def file_hash(path):
+    """sha256 of the file contents, remembered per (size, mtime) so it is computed once."""
+    path = Path(path)
+    stat = path.stat()
+    index = json.loads(INDEX.read_text()) if INDEX.exists() else {}
+    entry = index.get(path.name)
+    if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+        return entry["sha256"]
+
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    index[path.name] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": h.hexdigest()}
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    INDEX.write_text(json.dumps(index, indent=2))
+    return h.hexdigest()
+
+
+def cache_path(path):
+    path = Path(path)
+    return CACHE_DIR / f"{path.stem}-{file_hash(path)[:16]}.arrow"
+
+
+def cached(path):
+    """The cache file for path if it has been converted already, else None."""
+    if not Path(path).exists():
+        return None
+    target = cache_path(path)
+    return target if target.exists() else None
+
+
+def convert(path):
+    """Write path to the Arrow cache (once) and return the cache file."""
+    # imported here to avoid a cycle: the loader reads through this module
+    from benchmark.loader import clean_doc, read_rows
+
+    target = cache_path(path)
+    if target.exists():
+        return target
+
+    print(f"Converting {Path(path).name} -> {target.name} ...")
+    tmp = target.with_suffix(".tmp")
+    rows = 0
+    try:
+        with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, SCHEMA) as writer:
+            chunk = []
+            for values in read_rows(path):
+                chunk.append(clean_doc(values))
+                if len(chunk) == BATCH_ROWS:
+                    writer.write_batch(pa.RecordBatch.from_pylist(chunk, schema=SCHEMA))
+                    rows += len(chunk)
+                    chunk = []
+            if chunk:
+                writer.write_batch(pa.RecordBatch.from_pylist(chunk, schema=SCHEMA))
+                rows += len(chunk)
+    except BaseException:
+        # a half-written file must not be left behind in the cache
+        tmp.unlink(missing_ok=True)
+        raise
+    tmp.replace(target)
+    print(f"Cached {rows:,} rows in {target}")
+    return target
+
+
+def iter_batches(path, batch_size=BATCH_ROWS):
+    """Yield pyarrow RecordBatches of at most batch_size rows from the memory-mapped cache."""
+    with pa.memory_map(str(convert(path))) as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            for offset in range(0, batch.num_rows, batch_size):
+                yield batch.slice(offset, batch_size)
+
+
+def iter_docs(path, chunk_size=BATCH_ROWS):
+    """Yield lists of at most chunk_size review docs from the cache."""
+    chunk = []
+    for batch in iter_batches(path, chunk_size):
+        chunk.extend(batch.to_pylist())
+        if len(chunk) >= chunk_size:
+            yield chunk[:chunk_size]
+            chunk = chunk[chunk_size:]
+    if chunk:
+        yield chunk
+
+
+def read_column(path, name):
+    """Return one column of the cached dataset as a pyarrow ChunkedArray."""
+    with pa.memory_map(str(convert(path))) as source:
+        return pa.ipc.open_file(source).read_all().column(name)
+
+
+def convert_all(options=None):
+    """Convert every file in SOURCES that is present on disk."""
+    for path in SOURCES:
+        if path.exists():
+            convert(path)
@@ -0,0 +1,110 @@
+"""Multi-process client fleet.
+
+One Python process saturates a core decoding BSON / materializing rows
+long before either database is busy. run_fleet() starts N worker processes,
+each with its own backend connection (pool) and client threads, and merges
+the latency histograms they send back into one report.
+"""
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from benchmark.backends import get_backend
+from benchmark.backends.base import QUERY_NAMES
+from benchmark.histogram import Histogram
+
+
+def fleet_worker(backend_name, options, index, barrier):
+    """Run options.threads closed-loop clients for options.duration seconds.
+
+    Returns plain data (histograms as dicts) so it can cross the process
+    boundary. Failed calls are only counted in errors, not in the histograms.
+    """
+    try:
+        backend = get_backend(backend_name, options)
+    except BaseException:
+        # break the barrier so the workers already waiting on it fail instead of blocking forever
+        barrier.abort()
+        raise
+    names = options.queries or QUERY_NAMES
+    histograms = {name: Histogram() for name in names}
+    lock = threading.Lock()
+    errors = 0
+    clock = time.perf_counter_ns
+
+    def client(i, deadline):
+        nonlocal errors
+        while clock() < deadline:
+            name = names[i % len(names)]
+            i += 1
+            t0 = clock()
+            try:
+                backend.run_query(name)
+            except Exception:
+                with lock:
+                    errors += 1
+                continue
+            dt = clock() - t0
+            with lock:
+                histograms[name].record(dt)
+
+    try:
+        barrier.wait()  # every worker connected before anyone starts
+        start = clock()
+        deadline = start + int(options.duration * 1e9)
+        with ThreadPoolExecutor(max_workers=options.threads) as executor:
+            # offset each worker so the fleet does not send the same query in lockstep
+            for t in range(options.threads):
+                executor.submit(client, index * options.threads + t, deadline)
+        elapsed = (clock() - start) / 1e9
+    finally:
+        backend.close()
+
+    return {
+        "histograms": {name: h.to_dict() for name, h in histograms.items()},
+        "pool_wait": backend.pool_wait.to_dict(),
+        "errors": errors,
+        "elapsed": elapsed,
+    }
+
+
+def run_fleet(backend_name, options):
+    """Run fleet_worker in options.processes processes and merge their results.
+
+    Throughput counts successful calls only.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Manager() as manager:
+        barrier = manager.Barrier(options.processes)
+        with ProcessPoolExecutor(max_workers=options.processes, mp_context=ctx) as executor:
+            futures = [
+                executor.submit(fleet_worker, backend_name, options, i, barrier)
+                for i in range(options.processes)
+            ]
+            wait(futures)
+    # a worker that failed to connect breaks the barrier for all the others;
+    # report its error rather than theirs
+    errors = [f.exception() for f in futures if f.exception() is not None]
+    if errors:
+        raise next((e for e in errors if not isinstance(e, threading.BrokenBarrierError)), errors[0])
+    results = [f.result() for f in futures]
+
+    merged = {}
+    for result in results:
+        for name, data in result["histograms"].items():
+            merged.setdefault(name, Histogram()).merge(Histogram.from_dict(data))
+    total = Histogram()
+    for h in merged.values():
+        total.merge(h)
+    pool_wait = Histogram()
+    for result in results:
+        pool_wait.merge(Histogram.from_dict(result["pool_wait"]))
+    elapsed = max(r["elapsed"] for r in results)
+    return {
+        "histograms": merged,
+        "total": total,
+        "pool_wait": pool_wait,
+        "throughput": total.count / elapsed,
+        "errors": sum(r["errors"] for r in results),
+    }
@@ -0,0 +1,133 @@
+"""Seeded, vectorized synthetic review generator.
+
+Identical documents compress and cache far better than real reviews, so the
+workloads draw their data from DocGenerator instead: Zipf-distributed
+user_id / asin, log-normal text lengths, a rating histogram taken from the
+real dataset (when its Arrow cache exists) and a tunable asin == parent_asin
+ratio. Columns are generated with NumPy one chunk at a time, so tens of
+millions of records stream through bounded memory:
+
+    gen = DocGenerator(seed=42)
+    for docs in gen.chunks(10_000_000, 50_000):
+        ...
+"""
+import numpy as np
+
+from benchmark import config, dataset
+from benchmark.loader import DEFAULT_SOURCE
+
+ALPHABET = np.frombuffer(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ234567", dtype="S1")
+ALNUM = np.frombuffer(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789", dtype="S1")
+
+# share of ratings 1..5 in Amazon Fashion reviews, used when the dataset cache is missing
+FALLBACK_RATINGS = (0.09, 0.06, 0.08, 0.13, 0.64)
+
+WORDS = (
+    "cute fit size small large love great quality color fabric comfortable "
+    "dress shirt shoes wear looks nice perfect bought daughter gift soft "
+    "return cheap material recommend would again very well too but not "
+    "the and it is for this was so my i a of to in"
+).split()
+
+# 2020-01-01 .. 2023-12-31 in seconds
+TIME_RANGE = (1_577_836_800, 1_704_067_199)
+
+
+def real_rating_weights(path=DEFAULT_SOURCE):
+    """Rating shares 1..5 from the cached dataset, or None if it has not been converted."""
+    cache = dataset.cached(path)
+    if cache is None:
+        return None
+    ratings = np.asarray(dataset.read_column(path, "rating").drop_null())
+    counts = np.bincount(ratings, minlength=6)[1:6].astype(float)
+    return tuple(counts / counts.sum()) if counts.sum() else None
+
+
+def random_ids(rng, n, width, prefix=b"", alphabet=ALPHABET):
+    """n random fixed-width ids as a NumPy bytes array."""
+    chars = alphabet[rng.integers(0, len(alphabet), (n, width - len(prefix)))]
+    ids = chars.view(f"S{width - len(prefix)}").ravel()
+    return np.char.add(prefix, ids) if prefix else ids
+
+
+def zipf_cdf(n, s):
+    weights = 1.0 / np.arange(1, n + 1) ** s
+    cdf = np.cumsum(weights)
+    return cdf / cdf[-1]
+
+
+class DocGenerator:
+    def __init__(self, seed=42, users=100_000, products=20_000, zipf=1.1,
+                 same_parent_ratio=0.6, text_words=25, rating_weights=None):
+        self.rng = np.random.default_rng(seed)
+        self.same_parent_ratio = same_parent_ratio
+        self.text_words = text_words
+        weights = rating_weights or real_rating_weights() or FALLBACK_RATINGS
+        self.rating_weights = np.asarray(weights) / np.sum(weights)
+
+        # fixed universes of ids, drawn from with Zipf skew (rank 1 is the hottest)
+        self.user_ids = random_ids(self.rng, users, 28)
+        self.asins = random_ids(self.rng, products, 10, b"B0", ALNUM)
+        self.parent_asins = random_ids(self.rng, products, 10, b"B0", ALNUM)
+        self.user_cdf = zipf_cdf(users, zipf)
+        self.product_cdf = zipf_cdf(products, zipf)
+
+        # text is sliced out of one pre-built corpus, so each doc costs one slice
+        words = self.rng.choice(WORDS, 200_000)
+        self.corpus = " ".join(words)
+        self.word_starts = np.flatnonzero(
+            np.frombuffer(self.corpus.encode(), dtype="S1") == b" "
+        ) + 1
+
+    @classmethod
+    def from_options(cls, options):
+        return cls(
+            seed=options.seed,
+            users=options.users,
+            products=options.products,
+            zipf=options.zipf,
+            same_parent_ratio=options.same_parent_ratio,
+        )
+
+    def texts(self, n, mean_words):
+        """n text snippets with log-normal word counts around mean_words."""
+        rng = self.rng
+        lengths = np.maximum(1, rng.lognormal(np.log(mean_words), 0.8, n).astype(int))
+        # ~6 characters per word on average; cut at a word boundary
+        starts = self.word_starts[rng.integers(0, len(self.word_starts) - 1, n)]
+        ends = np.minimum(starts + lengths * 6, len(self.corpus))
+        corpus = self.corpus
+        return [corpus[s:e].rsplit(" ", 1)[0] or corpus[s:e] for s, e in zip(starts.tolist(), ends.tolist())]
+
+    def columns(self, n, offset=0, unique_users=False):
+        """Generate n records as {field: list}."""
+        rng = self.rng
+        if unique_users:
+            user_ids = [f"USER{i}" for i in range(offset + 1, offset + n + 1)]
+        else:
+            user_ids = self.user_ids[np.searchsorted(self.user_cdf, rng.random(n))].astype(str).tolist()
+        product = np.searchsorted(self.product_cdf, rng.random(n))
+        asin = self.asins[product]
+        other = self.parent_asins[np.searchsorted(self.product_cdf, rng.random(n))]
+        parent = np.where(rng.random(n) < self.same_parent_ratio, asin, other)
+        seconds = rng.integers(*TIME_RANGE, n).astype("datetime64[s]")
+        return {
+            "rating": (rng.choice(5, n, p=self.rating_weights) + 1).tolist(),
+            "title": self.texts(n, 3),
+            "text": self.texts(n, self.text_words),
+            "asin": asin.astype(str).tolist(),
+            "parent_asin": parent.astype(str).tolist(),
+            "user_id": user_ids,
+            "timestamp": np.datetime_as_string(seconds).tolist(),
+            "helpful_vote": (rng.geometric(0.6, n) - 1).tolist(),
+            "verified_purchase": (rng.random(n) < 0.9).tolist(),
+        }
+
+    def docs(self, n, offset=0, unique_users=False):
+        cols = self.columns(n, offset, unique_users)
+        return [dict(zip(config.FIELDS, row)) for row in zip(*(cols[f] for f in config.FIELDS))]
+
+    def chunks(self, n, chunk_size, unique_users=False):
+        """Yield lists of at most chunk_size docs, n in total."""
+        for offset in range(0, n, chunk_size):
+            yield self.docs(min(chunk_size, n - offset), offset, unique_users)
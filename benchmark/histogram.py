@@ -0,0 +1,122 @@
+"""Log-bucketed latency histogram in the style of HdrHistogram.
+
+Values (nanoseconds) below 2**SUB_BITS are counted exactly; above that each
+power of two is split into 2**(SUB_BITS - 1) linear sub-buckets, so every
+recorded value is reproduced within 1 / 2**(SUB_BITS - 1) (~0.8%) of its true
+value. Memory is a fixed list of counters no matter how many values are
+recorded, and two histograms merge by adding counters.
+"""
+
+SUB_BITS = 8
+SUB_COUNT = 1 << SUB_BITS
+HALF = SUB_COUNT // 2
+MAX_EXPONENT = 48  # 2**55 ns is more than a year
+
+# percentiles reported by default
+PERCENTILES = (50, 95, 99, 99.9)
+
+
+def bucket_index(value):
+    if value < SUB_COUNT:
+        return value
+    exp = value.bit_length() - SUB_BITS
+    return SUB_COUNT + (exp - 1) * HALF + (value >> exp) - HALF
+
+
+def bucket_value(index):
+    """Midpoint of the value range counted by bucket index."""
+    if index < SUB_COUNT:
+        return index
+    exp, sub = divmod(index - SUB_COUNT, HALF)
+    exp += 1
+    low = (sub + HALF) << exp
+    return low + ((1 << exp) - 1) // 2
+
+
+class Histogram:
+    """Fixed-size latency histogram; values are recorded in nanoseconds."""
+
+    def __init__(self):
+        self.counts = [0] * (SUB_COUNT + MAX_EXPONENT * HALF)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def record(self, value):
+        value = max(0, int(value))
+        self.counts[bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """Add every count from other into this histogram."""
+        for i, c in enumerate(other.counts):
+            if c:
+                self.counts[i] += c
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+        return self
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p):
+        """Value at percentile p (0..100)."""
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * p // 100))  # ceil
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return min(bucket_value(i), self.max)
+        return self.max
+
+    def percentiles(self, ps=PERCENTILES):
+        return {p: self.percentile(p) for p in ps}
+
+    def buckets(self):
+        """Yield (value, count) for every non-empty bucket."""
+        for i, c in enumerate(self.counts):
+            if c:
+                yield bucket_value(i), c
+
+    # plain-data form for sending between processes / storing
+    def to_dict(self):
+        return {
+            "counts": {i: c for i, c in enumerate(self.counts) if c},
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        h = cls()
+        for i, c in data["counts"].items():
+            h.counts[int(i)] = c
+        h.count = data["count"]
+        h.total = data["total"]
+        h.min = data["min"]
+        h.max = data["max"]
+        return h
+
+
+def format_table(histograms, ps=PERCENTILES):
+    """Render {label: Histogram} as a percentile table in microseconds."""
+    width = max([10, *(len(str(label)) + 1 for label in histograms)])
+    header = f"{'':<{width}}{'count':>10}{'mean':>10}" + "".join(f"{'p' + format(p, 'g'):>10}" for p in ps) + f"{'max':>10}"
+    lines = [header + "   (us)"]
+    for label, h in histograms.items():
+        cells = [h.mean()] + [h.percentile(p) for p in ps] + [h.max]
+        lines.append(f"{label:<{width}}{h.count:>10}" + "".join(f"{v / 1000:>10.1f}" for v in cells))
+    return "\n".join(lines)
@@ -0,0 +1,132 @@
+import csv
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from benchmark import config, dataset, profiler
+
+DEFAULT_SOURCE = config.DATASET_DIR / "dtb_100,000.xlsx"
+
+INT_FIELDS = ("rating", "helpful_vote")
+BOOL_FIELDS = ("verified_purchase",)
+
+
+def clean_doc(values):
+    """Turn one raw source record (dict) into a review doc with driver-friendly types."""
+    doc = {}
+    for f in config.FIELDS:
+        v = values.get(f)
+        if v is None or v != v or v == "":  # missing, NaN or empty cell
+            v = None if f in INT_FIELDS + BOOL_FIELDS else ""
+        elif f in INT_FIELDS:
+            v = int(float(v))
+        elif f in BOOL_FIELDS:
+            v = v if isinstance(v, bool) else str(v).strip().lower() in ("true", "1")
+        else:
+            v = str(v)
+        doc[f] = v
+    return doc
+
+
+def read_rows(path):
+    """Stream raw records (dicts) from an .xlsx or .csv file without loading it whole.
+
+    Only used to fill the Arrow cache; everything else reads through benchmark.dataset.
+    """
+    path = Path(path)
+    if path.suffix == ".csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+        return
+
+    import openpyxl
+
+    wb = openpyxl.load_workbook(path, read_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = [str(h) for h in next(rows)]
+        for row in rows:
+            yield dict(zip(header, row))
+    finally:
+        wb.close()
+
+
+def source_chunks(options):
+    """Chunks to load: synthetic records with --synthetic N, else the --source file."""
+    if getattr(options, "synthetic", None):
+        from benchmark.generator import DocGenerator
+
+        return DocGenerator.from_options(options).chunks(options.synthetic, options.chunk_size)
+    return dataset.iter_docs(options.source, options.chunk_size)
+
+
+class Progress:
+    """Thread-safe rows/sec reporter."""
+
+    def __init__(self, label, every=2.0):
+        self.label = label
+        self.every = every
+        self.rows = 0
+        self.start = self.last = time.perf_counter()
+        self.lock = threading.Lock()
+
+    def add(self, n):
+        with self.lock:
+            self.rows += n
+            now = time.perf_counter()
+            if now - self.last >= self.every:
+                self.last = now
+                self.report(now)
+
+    def report(self, now=None):
+        elapsed = (now or time.perf_counter()) - self.start
+        rate = self.rows / elapsed if elapsed else 0.0
+        print(f"[{self.label}] {self.rows:,} rows in {elapsed:.1f} s ({rate:,.0f} rows/s)")
+        return rate
+
+
+def load(backend, options):
+    """Reload the source collection/table from a dataset file.
+
+    The file is converted to the Arrow cache on first use (see
+    benchmark.dataset) and streamed from it in chunks of options.chunk_size;
+    every chunk is bulk inserted by one of options.workers threads, each
+    holding its own connection (insert_many(ordered=False) on MongoDB,
+    multi-row INSERT or COPY on CockroachDB, see --insert-strategy).
+    """
+    backend.use(config.SOURCE)
+    backend.reset()
+
+    local = threading.local()
+    connections = []
+    progress = Progress(backend.label)
+
+    def insert_chunk(docs):
+        if not hasattr(local, "backend"):
+            local.backend = backend.spawn()
+            local.backend.use(config.SOURCE)
+            connections.append(local.backend)
+        with profiler.region():
+            local.backend.insert_many(local.backend.prepare(docs))
+        progress.add(len(docs))
+
+    try:
+        with ThreadPoolExecutor(max_workers=options.workers) as executor:
+            pending = set()
+            for docs in source_chunks(options):
+                # keep at most two chunks per worker in memory
+                if len(pending) >= options.workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        fut.result()
+                pending.add(executor.submit(insert_chunk, docs))
+            for fut in pending:
+                fut.result()
+    finally:
+        for conn in connections:
+            conn.close()
+
+    rate = progress.report()
+    print(f"Loaded {progress.rows:,} rows into {backend.label} {config.SOURCE}")
+    return {"load": {"rows": progress.rows, "rows_per_sec": rate}}
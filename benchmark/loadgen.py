@@ -0,0 +1,75 @@
+"""Open-loop (fixed arrival rate) load generation.
+
+A closed loop only sends the next request once the previous one returned, so
+when the server stalls the client simply stops sending and the stall never
+shows up in the numbers (coordinated omission). Here requests are scheduled
+at fixed intervals regardless of how the previous ones are doing, and every
+latency is measured from the request's *scheduled* send time, so time spent
+queued behind a slow server is counted.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmark import profiler
+from benchmark.histogram import Histogram
+
+
+def run_open_loop(fns, rate, duration, max_in_flight=64):
+    """Issue fns round-robin at `rate` per second for `duration` seconds.
+
+    Returns a dict with the latency histogram (from scheduled send time),
+    the service time histogram (from actual start), the achieved throughput
+    and the number of failed calls. Failed calls count toward neither the
+    histograms nor the throughput, so fast errors cannot pass for capacity.
+    """
+    clock = time.perf_counter_ns
+    latency = Histogram()
+    service = Histogram()
+    lock = threading.Lock()
+    errors = 0
+
+    def job(fn, scheduled):
+        nonlocal errors
+        begin = clock()
+        try:
+            with profiler.region():
+                fn()
+        except Exception:
+            with lock:
+                errors += 1
+            return
+        end = clock()
+        with lock:
+            latency.record(end - scheduled)
+            service.record(end - begin)
+
+    total = max(1, int(rate * duration))
+    interval = 1e9 / rate
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        start = clock()
+        for i in range(total):
+            scheduled = start + int(i * interval)
+            delay = scheduled - clock()
+            if delay > 0:
+                time.sleep(delay / 1e9)
+            executor.submit(job, fns[i % len(fns)], scheduled)
+    elapsed = (clock() - start) / 1e9
+
+    return {
+        "rate": rate,
+        "requests": total,
+        "throughput": (total - errors) / elapsed,
+        "errors": errors,
+        "latency": latency,
+        "service": service,
+    }
+
+
+def saturated(result, slo_ms):
+    """True once the server can no longer keep up with the offered rate, or starts failing calls."""
+    return (
+        result["errors"] > 0
+        or result["throughput"] < 0.95 * result["rate"]
+        or result["latency"].percentile(99) > slo_ms * 1e6
+    )
@@ -0,0 +1,50 @@
+"""Execution plans of the benchmarked queries (--explain).
+
+Backends summarize explain("executionStats") / EXPLAIN ANALYZE into one
+dict per statement:
+
+    plan           stage / operator names, outermost first
+    indexes        indexes the plan reads
+    full_scan      whether it scans the whole collection or table
+    keys_examined  index keys examined (MongoDB)
+    docs_examined  documents examined (MongoDB)
+    rows_read      rows read from KV (CockroachDB)
+    returned       records returned or matched
+    time_ms        execution time reported by the server
+    raw            the server's explain output
+
+A full scan is flagged when the statement is selective, i.e. it returns at
+most SELECTIVE_FRACTION of what it examines; an index would help there.
+"""
+# returned / examined at or below which a full scan is flagged
+SELECTIVE_FRACTION = 0.1
+
+# numeric plan fields, in table order
+COUNTERS = ("keys_examined", "docs_examined", "rows_read", "returned", "time_ms")
+
+
+def examined(plan):
+    return max(plan.get("docs_examined") or 0, plan.get("rows_read") or 0, plan.get("keys_examined") or 0)
+
+
+def flagged(plan):
+    """Whether a selective statement was answered by a full scan."""
+    if not plan.get("full_scan"):
+        return False
+    return (plan.get("returned") or 0) <= SELECTIVE_FRACTION * examined(plan)
+
+
+def capture(backend, names, variant="", size=None):
+    """Explain each of QUERY_NAMES on the source; returns plan rows for the workload result."""
+    return [describe(backend.explain(name), name, variant, size) for name in names]
+
+
+def describe(plan, query, variant="", size=None):
+    """Print one plan summary and return it as a row tagged with query, variant and size."""
+    row = {"query": query, "variant": variant, "size": size, **plan}
+    where = " ".join(str(p) for p in (query, variant, size and f"n={size}") if p)
+    counters = ", ".join(f"{c}: {row[c]}" for c in COUNTERS if row.get(c) is not None)
+    flag = "  <-- full scan on a selective statement" if flagged(row) else ""
+    print(f"  plan {where}: {' > '.join(row['plan'])}"
+          f" [{', '.join(row['indexes']) or 'no index'}] {counters}{flag}")
+    return row
@@ -0,0 +1,174 @@
+"""Per-backend PNGs written into MongoDB_Images/ and CockroachDB_Images/.
+
+matplotlib is imported on first use with the non-interactive Agg backend,
+so benchmark runs never block on a window and runs with --no-plots never
+import it at all.
+"""
+from benchmark.config import ROOT
+
+# cleared by --no-plots
+enabled = True
+
+_plt = None
+
+
+def pyplot():
+    """matplotlib.pyplot, imported headless on first call."""
+    global _plt
+    if _plt is None:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        _plt = plt
+    return _plt
+
+
+def size_labels(sizes):
+    return [f"{s//1000}K" for s in sizes]
+
+
+def save(backend, filename):
+    """Save the current figure into the backend's images folder and close it."""
+    plt = pyplot()
+    path = ROOT / backend.images_dir / f"{filename}.png"
+    path.parent.mkdir(exist_ok=True)
+    plt.tight_layout()
+    plt.savefig(path, dpi=150)
+    plt.close()
+
+
+def percentile_curve(h):
+    """(xs, ys) for a latency-by-percentile curve: x = 1 / (1 - q), y in ms."""
+    seen = 0
+    xs, ys = [], []
+    for value, count in h.buckets():
+        seen += count
+        q = seen / h.count
+        if q >= 1.0:
+            q = 1 - 0.5 / h.count  # last point: keep it on the log axis
+        xs.append(1 / (1 - q))
+        ys.append(value / 1e6)
+    return xs, ys
+
+
+def draw_percentiles(ax, histograms):
+    """Draw one percentile curve per {label: Histogram} on ax with a log percentile axis."""
+    top = 10
+    for label, h in histograms.items():
+        if not h.count:
+            continue
+        xs, ys = percentile_curve(h)
+        ax.plot(xs, ys, label=label)
+        top = max([top, *xs])
+    ticks = [(1, "0%"), (2, "50%"), (10, "90%"), (100, "99%"), (1000, "99.9%"),
+             (10000, "99.99%"), (100000, "99.999%")]
+    ticks = [(x, name) for x, name in ticks if x <= top * 10]
+    ax.set_xscale("log")
+    ax.set_xticks([x for x, _ in ticks], [name for _, name in ticks])
+    ax.set_xlabel("Percentile")
+    ax.set_ylabel("Latency (ms)")
+    ax.grid(True, which="both", axis="both")
+    ax.legend()
+
+
+def plot_percentiles(backend, filename, histograms, title):
+    """Plot latency by percentile (log-scaled tail) for each {label: Histogram}."""
+    if not enabled:
+        return
+    plt = pyplot()
+    plt.figure(figsize=(10, 6))
+    draw_percentiles(plt.gca(), histograms)
+    plt.title(f"{title} ({backend.label})")
+    save(backend, filename)
+
+
+def draw_lines(ax, x, series, ci=None):
+    """One marked line per series on ax; series with a ci entry get error bars."""
+    for label, values in series.items():
+        if ci and label in ci:
+            yerr = [[v - lo for v, (lo, _) in zip(values, ci[label])],
+                    [hi - v for v, (_, hi) in zip(values, ci[label])]]
+            ax.errorbar(x, values, yerr=yerr, marker="o", capsize=4, label=label)
+        else:
+            ax.plot(x, values, marker="o", label=label)
+
+
+def plot_lines(backend, filename, x, series, title, xlabel, ylabel="Time (seconds)", size_axis=True,
+               ci=None):
+    """Plot one line per series against x, titled with the backend label.
+
+    ci optionally maps a series label to [(low, high), ...] drawn as error bars.
+    """
+    if not enabled:
+        return
+    plt = pyplot()
+    plt.figure(figsize=(10, 6))
+    draw_lines(plt.gca(), x, series, ci)
+    if size_axis:
+        plt.xticks(x, size_labels(x), rotation=45)
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel)
+    plt.title(f"{title} ({backend.label})")
+    plt.grid(True, axis="both")
+    plt.legend()
+    save(backend, filename)
+
+
+def plot_panels(backend, filename, x, panels, title, xlabel, size_axis=True, xticklabels=None):
+    """One subplot per {panel title: (series, ylabel)}, side by side."""
+    if not enabled:
+        return
+    plt = pyplot()
+    fig, axes = plt.subplots(1, len(panels), figsize=(6 * len(panels), 5), squeeze=False)
+    for ax, (panel, (series, ylabel)) in zip(axes[0], panels.items()):
+        for label, values in series.items():
+            ax.plot(x, values, marker="o", label=label)
+        if xticklabels is not None:
+            ax.set_xticks(x, xticklabels)
+        elif size_axis:
+            ax.set_xticks(x, size_labels(x), rotation=45)
+        ax.set_title(panel)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        ax.grid(True, axis="both")
+        ax.legend()
+    fig.suptitle(f"{title} ({backend.label})")
+    save(backend, filename)
+
+
+def draw_stacked(ax, breakdown, categories):
+    """One horizontal bar per {section: {category: seconds}}, stacked as shares of its wall time."""
+    names = list(breakdown)
+    left = [0.0] * len(names)
+    for category in categories:
+        shares = [100 * breakdown[n].get(category, 0) / (breakdown[n]["wall"] or 1) for n in names]
+        if any(shares):
+            ax.barh(names, shares, left=left, label=category)
+            left = [a + b for a, b in zip(left, shares)]
+    ax.invert_yaxis()
+    ax.set_xlim(0, 100)
+    ax.set_xlabel("Share of measured time (%)")
+    ax.grid(True, axis="x")
+    ax.legend()
+
+
+def plot_stacked(backend, filename, breakdown, categories, title):
+    """Stacked cost breakdown per section, see draw_stacked()."""
+    if not enabled or not breakdown:
+        return
+    plt = pyplot()
+    plt.figure(figsize=(10, 1.5 + 0.5 * len(breakdown)))
+    draw_stacked(plt.gca(), breakdown, categories)
+    plt.title(f"{title} ({backend.label})")
+    save(backend, filename)
+
+
+def stats_series(stats, sizes, variant, metrics):
+    """Means and CIs per metric from scheduler stats for one variant, ordered by sizes."""
+    series, ci = {}, {}
+    for metric, label in metrics.items():
+        cells = [stats[key][metric] for key in sorted(stats, key=lambda k: sizes.index(k[1]))
+                 if key[2] == variant and metric in stats[key]]
+        series[label] = [c["mean"] for c in cells]
+        ci[label] = [(c["ci_low"], c["ci_high"]) for c in cells]
+    return series, ci
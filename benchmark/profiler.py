@@ -0,0 +1,202 @@
+"""Where the client time goes: encode vs network vs server vs decode.
+
+With --profile every backend call made inside a timed region is
+instrumented. MongoDB feeds pymongo's command monitoring into it and
+CockroachDB uses a psycopg2 cursor that times parameter encoding,
+execution and row fetching separately and asks the server for its own
+statement latency. Whatever the wall time of the region does not account
+for is client-side Python (building records, the workload loop, and for
+MongoDB BSON encoding, which the driver does before the command is sent).
+
+Costs are grouped into sections, one per (backend, variant) of a scheduled
+workload or (backend, workload) otherwise, so a slow client shows up as
+such instead of passing for a slow database. --profile-sample adds a
+stack sampler that counts where the client threads are while a region runs.
+
+Timed regions cover only the measured calls of a workload (the same calls
+its timings cover), not its setup, plotting or idle waits. fleet (child
+processes) and async_queries (Motor / asyncpg) make their calls where
+neither hook can see them and are not profiled.
+
+Profiling adds work to every call, so runs made with it are not comparable
+with plain runs.
+"""
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+from benchmark.plotting import plot_stacked
+
+# stacking order of the breakdown; "client" is the wall time nothing else accounts for
+CATEGORIES = ("encode", "network", "network + server", "server", "decode", "client")
+
+# leaf frames in these modules are threads waiting for work, not client cost
+IDLE_MODULES = ("threading", "queue", "selectors", "concurrent.futures.thread", "concurrent.futures._base")
+
+# workloads whose driver calls the profiler cannot see
+UNPROFILED = ("async_queries", "fleet")
+
+_active = None
+
+
+class CostProfiler:
+    """Accumulates nanoseconds per (section, category) while a timed region runs."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = None
+        self.depth = 0
+        self.opened = None
+        self.costs = {}
+        self.samples = {}
+
+    def record(self, category, ns):
+        if not self.depth or self.current is None:
+            return
+        with self.lock:
+            costs = self.costs.setdefault(self.current, Counter())
+            costs[category] += ns
+
+    @contextmanager
+    def section(self, backend, name):
+        previous, self.current = self.current, (backend, name)
+        try:
+            yield
+        finally:
+            self.current = previous
+
+    @contextmanager
+    def region(self):
+        """A timed region; wall time counts while any region is open, so nested and overlapping ones count once."""
+        with self.lock:
+            if not self.depth:
+                self.opened = time.perf_counter_ns()
+            self.depth += 1
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.depth -= 1
+                if not self.depth and self.current is not None:
+                    costs = self.costs.setdefault(self.current, Counter())
+                    costs["wall"] += time.perf_counter_ns() - self.opened
+
+    def breakdown(self, backend):
+        """{section name: {category: seconds}} for one backend, client time filled in."""
+        out = {}
+        for (owner, name), costs in self.costs.items():
+            if owner != backend or not costs["wall"]:
+                continue
+            wall = costs["wall"] - costs["overhead"]
+            parts = {c: costs[c] / 1e9 for c in CATEGORIES if costs[c]}
+            parts["client"] = max(0, wall - sum(costs[c] for c in CATEGORIES)) / 1e9
+            parts["wall"] = wall / 1e9
+            out[name] = parts
+        return out
+
+    def hot_frames(self, backend, top=10):
+        """{section name: [(frame, share of samples)]} from the stack sampler."""
+        out = {}
+        for (owner, name), frames in self.samples.items():
+            total = sum(frames.values())
+            if owner == backend and total:
+                out[name] = [(frame, n / total) for frame, n in frames.most_common(top)]
+        return out
+
+
+class Sampler(threading.Thread):
+    """Samples the innermost Python frame of every busy client thread every interval seconds."""
+
+    def __init__(self, profiler, interval):
+        super().__init__(name="cost-sampler", daemon=True)
+        self.profiler = profiler
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        me = threading.get_ident()
+        while not self.stopped.wait(self.interval):
+            section = self.profiler.current
+            if not self.profiler.depth or section is None:
+                continue
+            daemons = {t.ident for t in threading.enumerate() if t.daemon}
+            frames = self.profiler.samples.setdefault(section, Counter())
+            for ident, frame in sys._current_frames().items():
+                if ident == me or ident in daemons:
+                    continue
+                module = frame.f_globals.get("__name__", "?")
+                if module in IDLE_MODULES:
+                    continue
+                frames[f"{module}:{frame.f_code.co_name}"] += 1
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def active():
+    """The running CostProfiler, or None when --profile is off."""
+    return _active
+
+
+def record(category, ns):
+    if _active is not None:
+        _active.record(category, ns)
+
+
+def region():
+    return nullcontext() if _active is None else _active.region()
+
+
+def section(backend, name):
+    return nullcontext() if _active is None else _active.section(backend, name)
+
+
+@contextmanager
+def profiling(enabled=True, sample_interval=None):
+    """Install a CostProfiler (and a Sampler every sample_interval seconds) for the block."""
+    global _active
+    if not enabled:
+        yield None
+        return
+    _active = CostProfiler()
+    sampler = Sampler(_active, sample_interval) if sample_interval else None
+    if sampler:
+        sampler.start()
+    try:
+        yield _active
+    finally:
+        if sampler:
+            sampler.stop()
+        _active = None
+
+
+def format_breakdown(breakdown):
+    """Table of seconds and share of wall time per category for {section: {category: seconds}}."""
+    shown = [c for c in CATEGORIES if any(c in parts for parts in breakdown.values())]
+    lines = [f"{'section':<32}{'wall':>10}" + "".join(f"{c:>17}" for c in shown)]
+    for name, parts in breakdown.items():
+        wall = parts["wall"] or 1
+        lines.append(f"{name:<32}{parts['wall']:>9.4f}s" + "".join(
+            f"{parts.get(c, 0):>10.4f}s {parts.get(c, 0) / wall:>5.0%}" for c in shown))
+    return "\n".join(lines)
+
+
+def attach(prof, backend, workload, result):
+    """Print and plot one backend's breakdown and return its workload result with it added."""
+    breakdown = prof.breakdown(backend.name)
+    if not breakdown:
+        return result
+    print(f"\nCost breakdown ({backend.label}):\n{format_breakdown(breakdown)}")
+    plot_stacked(backend, f"cost_breakdown_{workload}", breakdown, CATEGORIES, f"Client Cost Breakdown: {workload}")
+    result = {**(result or {}), "cost_breakdown": breakdown}
+    frames = prof.hot_frames(backend.name)
+    if frames:
+        for name, top in frames.items():
+            print(f"\nHottest client frames, {name}:")
+            for frame, share in top:
+                print(f"  {share:>6.1%}  {frame}")
+        result["hot_frames"] = frames
+    return result
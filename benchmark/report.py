@@ -0,0 +1,440 @@
+"""Self-contained HTML report of stored runs.
+
+    python -m benchmark report                  # latest run of every workload
+    python -m benchmark report --runs 4,7       # just these runs
+
+Reads runs from the results store and writes one HTML file (Results/report.html
+by default, see --output) with every figure embedded as a PNG data URI.
+MongoDB and CockroachDB are overlaid on the same axes per workload and each
+section has a speedup table. Nothing is shown on screen, so it runs
+headless.
+"""
+import base64
+import html
+import io
+import json
+
+from benchmark.backends import BACKENDS, load_class
+from benchmark.histogram import PERCENTILES, Histogram
+from benchmark.plotting import draw_lines, draw_percentiles, draw_stacked, pyplot, size_labels
+from benchmark.plans import SELECTIVE_FRACTION, examined, flagged
+from benchmark.profiler import CATEGORIES
+from benchmark.results import ResultsStore
+
+STYLE = """
+body { font-family: sans-serif; margin: 2em auto; max-width: 1200px; color: #222; }
+h1, h2 { border-bottom: 1px solid #ccc; }
+table { border-collapse: collapse; margin: 1em 0; }
+th, td { border: 1px solid #ccc; padding: 0.25em 0.6em; text-align: right; }
+th:first-child, td:first-child { text-align: left; }
+img { max-width: 100%; }
+.meta { color: #666; font-size: 0.9em; }
+"""
+
+
+def label(backend):
+    try:
+        return load_class(BACKENDS[backend]).label
+    except (KeyError, ImportError):
+        return backend
+
+
+def speedup_header():
+    first, *others = [label(b) for b in BACKENDS]
+    return f"Speedup ({first} vs {', '.join(others)})"
+
+
+# rendering helpers
+def figure_html(fig):
+    plt = pyplot()
+    buf = io.BytesIO()
+    fig.tight_layout()
+    fig.savefig(buf, format="png", dpi=110)
+    plt.close(fig)
+    data = base64.b64encode(buf.getvalue()).decode()
+    return f'<img src="data:image/png;base64,{data}">'
+
+
+def panels_figure(panels, xlabel, ylabel, xticks=None, logx=False):
+    """One subplot per {title: {line label: (x, y, ci or None)}}; returns an <img> tag."""
+    plt = pyplot()
+    cols = min(3, len(panels))
+    rows = -(-len(panels) // cols)
+    fig, axes = plt.subplots(rows, cols, figsize=(6 * cols, 4.5 * rows), squeeze=False)
+    for ax in axes.flat[len(panels):]:
+        ax.set_visible(False)
+    for ax, (title, lines) in zip(axes.flat, panels.items()):
+        for line, (x, y, ci) in lines.items():
+            draw_lines(ax, x, {line: y}, {line: ci} if ci else None)
+        if xticks is not None:
+            ax.set_xticks(*xticks)
+        if logx:
+            ax.set_xscale("log")
+        ax.set_title(title)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        ax.grid(True, axis="both")
+        ax.legend()
+    return figure_html(fig)
+
+
+def percentiles_figure(panels):
+    """One latency-by-percentile subplot per {title: {label: Histogram}}."""
+    plt = pyplot()
+    cols = min(3, len(panels))
+    rows = -(-len(panels) // cols)
+    fig, axes = plt.subplots(rows, cols, figsize=(6 * cols, 4.5 * rows), squeeze=False)
+    for ax in axes.flat[len(panels):]:
+        ax.set_visible(False)
+    for ax, (title, hists) in zip(axes.flat, panels.items()):
+        draw_percentiles(ax, hists)
+        ax.set_title(title)
+    return figure_html(fig)
+
+
+def table(headers, rows):
+    head = "".join(f"<th>{html.escape(str(h))}</th>" for h in headers)
+    body = "".join(
+        "<tr>" + "".join(f"<td>{html.escape(cell(v))}</td>" for v in row) + "</tr>" for row in rows
+    )
+    return f"<table><tr>{head}</tr>{body}</table>"
+
+
+def cell(value):
+    if isinstance(value, float):
+        return f"{value:.4g}"
+    return "-" if value is None else str(value)
+
+
+def ratio(first, other, higher_is_better=False):
+    """How many times better the first backend is than another."""
+    if not first or not other:
+        return None
+    return first / other if higher_is_better else other / first
+
+
+def speedup_rows(points, higher_is_better=False):
+    """points: {row label: {backend: value}} -> rows of label, value per backend, speedups."""
+    rows = []
+    first, *others = BACKENDS
+    for name, values in points.items():
+        row = [name, *(values.get(b) for b in BACKENDS)]
+        row += [ratio(values.get(first), values.get(o), higher_is_better) for o in others]
+        rows.append(row)
+    return rows
+
+
+def speedup_table(points, unit, higher_is_better=False):
+    headers = ["", *(f"{label(b)} ({unit})" for b in BACKENDS), speedup_header()]
+    return table(headers, speedup_rows(points, higher_is_better))
+
+
+def percentile_table(hists):
+    """{label: Histogram} -> table of count and percentiles in ms."""
+    rows = [[name, h.count, *(h.percentile(p) / 1e6 for p in PERCENTILES)]
+            for name, h in hists.items() if h.count]
+    return table(["", "count", *(f"p{p:g} (ms)" for p in PERCENTILES)], rows)
+
+
+# per-workload sections: fn(options, results, stats) -> html
+def scheduled(options, results, stats):
+    """Time and throughput per (variant, metric) from the scheduler stats, backends overlaid."""
+    sizes = options["sizes"]
+    groups = sorted({(k[2], k[3]) for k in stats})
+    times, throughput, points = {}, {}, {}
+    for variant, metric in groups:
+        title = f"{variant} {metric}"
+        for backend in BACKENDS:
+            cells = [stats.get((backend, n, variant, metric)) for n in sizes]
+            if not any(cells):
+                continue
+            xs = [n for n, c in zip(sizes, cells) if c]
+            cells = [c for c in cells if c]
+            times.setdefault(title, {})[label(backend)] = (
+                xs, [c["mean"] for c in cells], [(c["ci_low"], c["ci_high"]) for c in cells])
+            throughput.setdefault(title, {})[label(backend)] = (
+                xs, [n / c["mean"] for n, c in zip(xs, cells)],
+                [(n / c["ci_high"], n / c["ci_low"]) for n, c in zip(xs, cells)])
+            for n, c in zip(xs, cells):
+                points.setdefault(f"{title} n={n}", {})[backend] = c["mean"]
+    ticks = (sizes, size_labels(sizes))
+    parts = [
+        "<h3>Time (mean, 95% CI)</h3>",
+        panels_figure(times, "Records", "Time (seconds)", xticks=ticks),
+        "<h3>Throughput</h3>",
+        panels_figure(throughput, "Records", "Records / second", xticks=ticks),
+        "<h3>Speedup</h3>",
+        speedup_table(points, "s"),
+    ]
+    return "\n".join(parts)
+
+
+def query_optimization(options, results, stats):
+    """Scheduler stats plus the subset setup, which is kept out of the measured update."""
+    times, rows = {}, []
+    for backend, result in results.items():
+        for step in result.get("setup", []):
+            times.setdefault(f"n={step['size']} (from {step['from']})", {})[backend] = step["seconds"]
+            rows.append([f"{label(backend)} n={step['size']}", step["seconds"],
+                         step["client_peak_mb"], step["client_growth_mb"]])
+    parts = [scheduled(options, results, stats)]
+    if times:
+        parts += [
+            "<h3>Subset setup (not measured)</h3>",
+            speedup_table(times, "s"),
+            table(["", "setup (s)", "client RSS peak (MB)", "client RSS growth (MB)"], rows),
+        ]
+    return "\n".join(parts)
+
+
+def data_manipulation(options, results, stats):
+    parts = [scheduled(options, results, stats)]
+    # single-operation latency percentiles at the largest size
+    size = str(max(options["sizes"]))
+    panels, rows = {}, {}
+    for backend, result in results.items():
+        hists = result.get("single_latency", {}).get(size, {})
+        for op, data in hists.items():
+            h = Histogram.from_dict(data)
+            panels.setdefault(f"Single {op}, n={size}", {})[label(backend)] = h
+            rows[f"{label(backend)} {op}"] = h
+    if panels:
+        parts += ["<h3>Single-operation latency</h3>", percentiles_figure(panels), percentile_table(rows)]
+    return "\n".join(parts)
+
+
+def batch_size(options, results, stats):
+    """Throughput vs write batch size, one panel per (size, operation)."""
+    labels = ["all" if b is None else str(b) for b in options["write_batch_sizes"]]
+    x = list(range(len(labels)))
+    panels, points = {}, {}
+    for size in options["sizes"]:
+        for op in ("Insert", "Update", "Delete"):
+            for backend in BACKENDS:
+                cells = [stats.get((backend, size, label, op)) for label in labels]
+                if not all(cells):
+                    continue
+                values = [size / c["mean"] for c in cells]
+                panels.setdefault(f"{op}, n={size}", {})[label(backend)] = (x, values, None)
+                for batch, value in zip(labels, values):
+                    points.setdefault(f"{op} n={size} batch={batch}", {})[backend] = value
+    return "\n".join([
+        panels_figure(panels, "Batch size", "Records / second", xticks=(x, labels)),
+        speedup_table(points, "records/s", higher_is_better=True),
+    ])
+
+
+def concurrent_queries(options, results, stats):
+    counts = options["concurrency"]
+    panels, points = {}, {}
+    for backend, result in results.items():
+        for series, values in result["concurrent_queries"].items():
+            panels.setdefault(series, {})[label(backend)] = (counts, values, None)
+        for series, values in result["concurrent_queries"].items():
+            if series.startswith("Response Time"):
+                level = series.removeprefix("Response Time")
+                for count, value in zip(counts, values):
+                    points.setdefault(f"{count} concurrent{level}", {})[backend] = value
+    return "\n".join([
+        panels_figure(panels, "Concurrent queries", "Seconds"),
+        speedup_table(points, "s"),
+    ])
+
+
+def open_loop(options, results, stats):
+    panels, sustainable = {}, {}
+    for backend, result in results.items():
+        data = result["open_loop"]
+        for key, values in data.items():
+            if key.startswith("p"):
+                panels.setdefault(f"{key} latency", {})[label(backend)] = (data["throughput"], values, None)
+        sustainable.setdefault("Sustainable rate", {})[backend] = data["sustainable"]
+    return "\n".join([
+        panels_figure(panels, "Throughput (queries/s)", "Latency (ms)"),
+        speedup_table(sustainable, "queries/s", higher_is_better=True),
+    ])
+
+
+def async_queries(options, results, stats):
+    levels = options["async_concurrency"]
+    panels, points = {}, {}
+    for backend, result in results.items():
+        for group in ("async_throughput", "async_latency"):
+            for series, values in result[group].items():
+                panels.setdefault(series, {})[label(backend)] = (levels[:len(values)], values, None)
+        for level, value in zip(levels, result["async_throughput"]["Throughput"]):
+            points.setdefault(f"{level} in flight", {})[backend] = value
+    return "\n".join([
+        panels_figure(panels, "Queries in flight", "queries/s | ms", logx=True),
+        speedup_table(points, "queries/s", higher_is_better=True),
+    ])
+
+
+def fleet(options, results, stats):
+    panels, rows, points = {}, {}, {}
+    for backend, result in results.items():
+        data = result["fleet"]
+        points.setdefault("Throughput", {})[backend] = data["throughput"]
+        for query, hist in data["histograms"].items():
+            h = Histogram.from_dict(hist)
+            panels.setdefault(query, {})[label(backend)] = h
+            rows[f"{label(backend)} {query}"] = h
+    return "\n".join([
+        speedup_table(points, "queries/s", higher_is_better=True),
+        percentiles_figure(panels),
+        percentile_table(rows),
+    ])
+
+
+def memory_usage(options, results, stats):
+    sizes = options["sizes"]
+    lines = {}
+    for backend, result in results.items():
+        for metric, values in result["memory_usage"].items():
+            lines[f"{label(backend)}: {metric}"] = (sizes, values, None)
+    return panels_figure({"Peak memory": lines}, "Records", "MB")
+
+
+def streaming(options, results, stats):
+    panels, ticks = {}, None
+    for backend, result in results.items():
+        data = result["streaming"]
+        x = list(range(len(data["modes"])))
+        for key, title in (("ttfr", "Time to first record (s)"), ("total", "Total scan time (s)"),
+                           ("memory", "Peak client memory (MB)")):
+            for query, values in data[key].items():
+                panels.setdefault(title, {})[f"{label(backend)}: {query}"] = (x, values, None)
+        ticks = (x, data["modes"])
+    return panels_figure(panels, "Cursor batch size", "", xticks=ticks)
+
+
+def transactions(options, results, stats):
+    panels, points, rows = {}, {}, {}
+    for backend, result in results.items():
+        data = result["transactions"]
+        x = data["hot_keys"]
+        for key, title in (("tps", "Committed TPS"), ("retry_rate", "Retry rate"), ("abort_rate", "Abort rate")):
+            panels.setdefault(title, {})[label(backend)] = (x, [r[key] for r in data["runs"]], None)
+        for hot, run in zip(x, data["runs"]):
+            points.setdefault(f"hot set {hot}", {})[backend] = run["tps"]
+            rows[f"{label(backend)} hot={hot}"] = Histogram.from_dict(run["latency"])
+    return "\n".join([
+        panels_figure(panels, "Hot keys", "", logx=True),
+        speedup_table(points, "TPS", higher_is_better=True),
+        "<h3>Latency including retries</h3>",
+        percentile_table(rows),
+    ])
+
+
+def load(options, results, stats):
+    points = {"Load rate": {b: r["load"]["rows_per_sec"] for b, r in results.items()}}
+    return speedup_table(points, "rows/s", higher_is_better=True)
+
+
+def cost_breakdown(results):
+    """Stacked client cost breakdown of a --profile run, one panel per backend; None without one."""
+    profiled = {b: r["cost_breakdown"] for b, r in results.items() if isinstance(r, dict) and r.get("cost_breakdown")}
+    if not profiled:
+        return None
+    plt = pyplot()
+    height = max(len(breakdown) for breakdown in profiled.values())
+    fig, axes = plt.subplots(1, len(profiled), figsize=(8 * len(profiled), 1.5 + 0.5 * height), squeeze=False)
+    rows = []
+    for ax, (backend, breakdown) in zip(axes[0], profiled.items()):
+        draw_stacked(ax, breakdown, CATEGORIES)
+        ax.set_title(label(backend))
+        for name, parts in breakdown.items():
+            rows.append([f"{label(backend)}: {name}", parts["wall"], *(parts.get(c) for c in CATEGORIES)])
+    return "\n".join([
+        "<h3>Client cost breakdown</h3>",
+        figure_html(fig),
+        table(["", "wall (s)", *(f"{c} (s)" for c in CATEGORIES)], rows),
+    ])
+
+
+def plans_table(plans):
+    """Captured execution plans of a --explain run; full scans of selective statements are flagged."""
+    if not plans:
+        return None
+    rows = [
+        [label(p["backend"]), p["query"], p["variant"], p["size"], " > ".join(p["plan"]),
+         ", ".join(p["indexes"]) or "-", examined(p), p["returned"], p["time_ms"],
+         "FULL SCAN" if flagged(p) else ""]
+        for p in plans
+    ]
+    n = sum(1 for p in plans if flagged(p))
+    note = (f"<p>{n} statement(s) scan everything while returning at most {SELECTIVE_FRACTION:.0%} "
+            f"of what they examine; an index should serve them.</p>" if n else "")
+    return "\n".join([
+        "<h3>Execution plans</h3>",
+        note,
+        table(["", "query", "variant", "n", "plan", "indexes", "examined", "returned", "time (ms)", ""], rows),
+    ])
+
+
+SECTIONS = {
+    "async_queries": async_queries,
+    "batch_size": batch_size,
+    "concurrent_queries": concurrent_queries,
+    "constraint": scheduled,
+    "data_manipulation": data_manipulation,
+    "fleet": fleet,
+    "load": load,
+    "memory_usage": memory_usage,
+    "open_loop": open_loop,
+    "query_optimization": query_optimization,
+    "streaming": streaming,
+    "transactions": transactions,
+}
+
+
+def run_section(store, run):
+    options = json.loads(run["options"])
+    results = json.loads(run["result"] or "{}")
+    versions = json.loads(run["versions"] or "{}")
+    meta = (f"run {run['id']}, {run['started']}, commit {(run['git_commit'] or '-')[:12]}"
+            f"{' (dirty)' if run['git_dirty'] else ''}; " + ", ".join(versions.values()))
+    render = SECTIONS.get(run["workload"])
+    try:
+        body = render(options, results, store.stats(run["id"])) if render else None
+    except (KeyError, TypeError, ValueError) as exc:
+        body = f"<p>Could not render: {html.escape(repr(exc))}</p>"
+    if body is None:
+        body = f"<pre>{html.escape(json.dumps(results, indent=2))}</pre>"
+    for extra in (cost_breakdown(results), plans_table(store.plans(run["id"]))):
+        if extra:
+            body += "\n" + extra
+    return (f"<h2>{html.escape(run['workload'])}</h2>"
+            f'<p class="meta">{html.escape(meta)}</p>\n{body}')
+
+
+def report(options):
+    """`report` command: render stored runs into one HTML file."""
+    with ResultsStore(options.results) as store:
+        if options.runs:
+            runs = [store.run(i) for i in options.runs]
+        else:
+            latest = {}
+            for run in store.runs():
+                if run["finished"]:
+                    latest[run["workload"]] = run
+            runs = [latest[w] for w in sorted(latest)]
+        if not runs:
+            raise SystemExit(f"No finished runs in {store.path}")
+        host = json.loads(runs[-1]["host"])
+        sections = [run_section(store, run) for run in runs]
+
+    ram = host["ram_bytes"] / 2**30
+    page = f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>MongoDB vs CockroachDB benchmark report</title>
+<style>{STYLE}</style></head><body>
+<h1>MongoDB vs CockroachDB benchmark report</h1>
+<p class="meta">{html.escape(host["platform"])}, {host["cpu_count"]} CPUs, {ram:.1f} GiB RAM,
+Python {html.escape(host["python"])}. Speedup is how many times faster the first database is
+(&gt; 1 means {label(next(iter(BACKENDS)))} wins).</p>
+{"".join(sections)}
+</body></html>
+"""
+    options.output.parent.mkdir(parents=True, exist_ok=True)
+    options.output.write_text(page, encoding="utf-8")
+    print(f"Wrote {options.output} ({len(runs)} runs)")
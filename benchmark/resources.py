@@ -0,0 +1,104 @@
+"""Client and server resource sampling per workload phase.
+
+ResourceCollector.phase() samples, in a background thread, the client's
+RSS, the database server process (RSS/CPU/IO through psutil, when it runs
+on this host) and whatever Backend.server_metrics() reports (MongoDB
+serverStatus, CockroachDB crdb_internal.node_metrics). Each phase is
+summarized as {"memory": peaks, "cpu": averages, "io": deltas}.
+"""
+import threading
+from contextlib import contextmanager
+
+import psutil
+
+MB = 1024 * 1024
+
+
+def find_process(names):
+    """First local process whose name is one of names, or None."""
+    for proc in psutil.process_iter(["name"]):
+        if proc.info["name"] in names:
+            return proc
+    return None
+
+
+def io_bytes(proc):
+    try:
+        io = proc.io_counters()
+        return io.read_bytes, io.write_bytes
+    except (psutil.Error, AttributeError):  # not available on every platform
+        return None
+
+
+class ResourceCollector:
+    def __init__(self, backend, interval=0.5):
+        self.backend = backend
+        self.interval = interval
+        self.client = psutil.Process()
+        self.server = find_process(backend.server_process_names)
+        self.server_metrics = True
+        if self.server is None:
+            print(f"No local {'/'.join(backend.server_process_names)} process, "
+                  "server process metrics skipped")
+
+    def sample_memory(self):
+        memory = {"Client RSS": self.client.memory_info().rss / MB}
+        if self.server is not None:
+            try:
+                memory["Server RSS"] = self.server.memory_info().rss / MB
+            except psutil.Error:
+                pass
+        metrics = {}
+        if self.server_metrics:
+            try:
+                metrics = self.backend.server_metrics()
+            except Exception as exc:  # e.g. no permission for serverStatus / crdb_internal
+                print(f"Server metrics unavailable, skipped: {exc}")
+                self.server_metrics = False
+        memory.update(metrics.get("memory", {}))
+        return memory, metrics.get("cpu", {})
+
+    @contextmanager
+    def phase(self):
+        """Sample while the body runs; the yielded dict is filled in on exit."""
+        summary = {}
+        samples = []
+        stop = threading.Event()
+
+        def sampler():
+            while not stop.wait(self.interval):
+                samples.append(self.sample_memory())
+
+        # cpu_percent() averages since its previous call, so prime it here
+        self.client.cpu_percent()
+        procs = {"Client": self.client}
+        if self.server is not None:
+            procs["Server"] = self.server
+            self.server.cpu_percent()
+        io_start = {label: io_bytes(p) for label, p in procs.items()}
+        samples.append(self.sample_memory())
+        thread = threading.Thread(target=sampler, daemon=True)
+        thread.start()
+        try:
+            yield summary
+        finally:
+            stop.set()
+            thread.join()
+            samples.append(self.sample_memory())
+
+            memory = {}
+            server_cpu = {}
+            for mem, cpu in samples:
+                for k, v in mem.items():
+                    memory[k] = max(memory.get(k, 0.0), v)
+                for k, v in cpu.items():
+                    server_cpu.setdefault(k, []).append(v)
+            cpu = {f"{label} CPU": p.cpu_percent() for label, p in procs.items()}
+            cpu.update({k: sum(v) / len(v) for k, v in server_cpu.items()})
+            io = {}
+            for label, p in procs.items():
+                end = io_bytes(p)
+                if end and io_start[label]:
+                    io[f"{label} read"] = (end[0] - io_start[label][0]) / MB
+                    io[f"{label} write"] = (end[1] - io_start[label][1]) / MB
+            summary.update(memory=memory, cpu=cpu, io=io)
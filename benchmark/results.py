@@ -0,0 +1,356 @@
+"""Persistent results store and baseline comparison.
+
+Every `python -m benchmark <workload>` invocation becomes one run in a
+SQLite database (Results/results.db by default, see --results). A run
+holds the options, the git commit, host CPU/RAM, driver and server
+versions, the workload's return value as JSON and, for scheduled
+workloads, every raw sample with its summary stats. Runs made with
+--explain also keep the execution plan of every explained statement.
+
+    python -m benchmark runs                         # list stored runs
+    python -m benchmark compare --baseline 3         # latest run vs run 3
+    python -m benchmark compare --baseline 3 --run 7
+
+compare matches cells (backend, size, variant, metric) of the two runs and
+flags a regression when the bootstrap CI of the relative slowdown lies
+entirely above --threshold.
+"""
+import json
+import platform
+import sqlite3
+import subprocess
+import sys
+from datetime import datetime, timezone
+from importlib import metadata
+
+import numpy as np
+import psutil
+
+from benchmark import config
+from benchmark.scheduler import CONFIDENCE, RESAMPLES
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    workload TEXT NOT NULL,
+    started TEXT NOT NULL,
+    finished TEXT,
+    options TEXT NOT NULL,
+    git_commit TEXT,
+    git_dirty INTEGER,
+    host TEXT NOT NULL,
+    versions TEXT,
+    result TEXT
+);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    backend TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    variant TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    repetition INTEGER NOT NULL,
+    value REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stats (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    backend TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    variant TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    mean REAL NOT NULL,
+    median REAL NOT NULL,
+    ci_low REAL NOT NULL,
+    ci_high REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS plans (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    backend TEXT NOT NULL,
+    query TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    size INTEGER,
+    plan TEXT NOT NULL,
+    indexes TEXT NOT NULL,
+    full_scan INTEGER NOT NULL,
+    keys_examined INTEGER,
+    docs_examined INTEGER,
+    rows_read INTEGER,
+    returned INTEGER,
+    time_ms REAL,
+    raw TEXT
+);
+CREATE INDEX IF NOT EXISTS samples_run ON samples (run_id);
+CREATE INDEX IF NOT EXISTS stats_run ON stats (run_id);
+CREATE INDEX IF NOT EXISTS plans_run ON plans (run_id);
+"""
+
+# client libraries whose versions are recorded with each run
+DRIVERS = ("pymongo", "motor", "psycopg2-binary", "asyncpg", "pyarrow", "numpy")
+
+
+def git_state():
+    """(commit, dirty) of the working tree, or (None, None) outside git."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=config.ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=config.ROOT,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, bool(status.strip())
+
+
+def host_info():
+    drivers = {}
+    for name in DRIVERS:
+        try:
+            drivers[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            pass
+    return {
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": psutil.cpu_count(logical=True),
+        "cpu_physical": psutil.cpu_count(logical=False),
+        "ram_bytes": psutil.virtual_memory().total,
+        "python": sys.version.split()[0],
+        "drivers": drivers,
+    }
+
+
+def server_version(backend):
+    try:
+        return backend.server_version()
+    except Exception as exc:  # version is metadata; never fail a run over it
+        return f"unknown ({exc})"
+
+
+def to_json(value):
+    """JSON for workload results; histograms become their to_dict()."""
+    def default(obj):
+        if hasattr(obj, "to_dict"):
+            return obj.to_dict()
+        return str(obj)
+    return json.dumps(value, default=default)
+
+
+class ResultsStore:
+    def __init__(self, path=None):
+        self.path = path or config.RESULTS_DB
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # writing
+    def start_run(self, options):
+        commit, dirty = git_state()
+        with self.db:
+            cur = self.db.execute(
+                "INSERT INTO runs (workload, started, options, git_commit, git_dirty, host)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (options.workload, now(), to_json(vars(options)), commit, dirty, json.dumps(host_info())),
+            )
+        return cur.lastrowid
+
+    def set_versions(self, run_id, versions):
+        """versions: {backend name: server version string}."""
+        with self.db:
+            self.db.execute("UPDATE runs SET versions = ? WHERE id = ?", (json.dumps(versions), run_id))
+
+    def add_sample(self, run_id, key, repetition, metrics):
+        """One recorded scheduler pass: key = (backend, size, variant), metrics = {metric: value}."""
+        backend, size, variant = key
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, backend, size, variant, metric, repetition, value) for metric, value in metrics.items()],
+            )
+
+    def add_stats(self, run_id, stats):
+        """stats as returned by scheduler.summarize_all()."""
+        rows = [
+            (run_id, backend, size, variant, metric, s["n"], s["mean"], s["median"], s["ci_low"], s["ci_high"])
+            for (backend, size, variant), metrics in stats.items()
+            for metric, s in metrics.items()
+        ]
+        with self.db:
+            self.db.executemany("INSERT INTO stats VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def add_plans(self, run_id, backend, plans):
+        """Plan rows as returned by benchmark.plans.capture()/describe()."""
+        rows = [
+            (run_id, backend, p["query"], p["variant"], p["size"], json.dumps(p["plan"]), json.dumps(p["indexes"]),
+             p["full_scan"], p["keys_examined"], p["docs_examined"], p["rows_read"], p["returned"], p["time_ms"],
+             to_json(p["raw"]))
+            for p in plans
+        ]
+        with self.db:
+            self.db.executemany("INSERT INTO plans VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def finish_run(self, run_id, result):
+        with self.db:
+            self.db.execute("UPDATE runs SET finished = ?, result = ? WHERE id = ?",
+                            (now(), to_json(result), run_id))
+
+    # reading
+    def runs(self):
+        return self.db.execute("SELECT * FROM runs ORDER BY id").fetchall()
+
+    def run(self, run_id):
+        row = self.db.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+        if row is None:
+            raise SystemExit(f"No run {run_id} in {self.path}")
+        return row
+
+    def latest_run(self, workload, exclude):
+        row = self.db.execute(
+            "SELECT * FROM runs WHERE workload = ? AND id != ? AND finished IS NOT NULL"
+            " ORDER BY id DESC LIMIT 1",
+            (workload, exclude),
+        ).fetchone()
+        if row is None:
+            raise SystemExit(f"No finished {workload} run to compare with run {exclude}")
+        return row
+
+    def done_passes(self, run_id):
+        """{((backend, size, variant), repetition): {metric: value}} already recorded for a run."""
+        done = {}
+        for r in self.db.execute(
+            "SELECT backend, size, variant, metric, repetition, value FROM samples WHERE run_id = ?", (run_id,)
+        ):
+            key = ((r["backend"], r["size"], r["variant"]), r["repetition"])
+            done.setdefault(key, {})[r["metric"]] = r["value"]
+        return done
+
+    def stats(self, run_id):
+        """{(backend, size, variant, metric): summary row} of a run."""
+        return {
+            (r["backend"], r["size"], r["variant"], r["metric"]): dict(r)
+            for r in self.db.execute("SELECT * FROM stats WHERE run_id = ?", (run_id,))
+        }
+
+    def plans(self, run_id):
+        """Plan rows of a run, with plan and indexes decoded back to lists."""
+        rows = []
+        for r in self.db.execute("SELECT * FROM plans WHERE run_id = ? ORDER BY backend, query, size, variant",
+                                 (run_id,)):
+            row = dict(r)
+            row["plan"], row["indexes"] = json.loads(row["plan"]), json.loads(row["indexes"])
+            rows.append(row)
+        return rows
+
+    def samples(self, run_id):
+        """{(backend, size, variant, metric): [values]} of a run."""
+        out = {}
+        for r in self.db.execute(
+            "SELECT backend, size, variant, metric, value FROM samples WHERE run_id = ?"
+            " ORDER BY repetition", (run_id,)
+        ):
+            out.setdefault((r["backend"], r["size"], r["variant"], r["metric"]), []).append(r["value"])
+        return out
+
+
+# options that belong to the resuming invocation rather than to the run
+LOCAL_OPTIONS = ("resume", "results", "output")
+
+
+def resume_options(options, run):
+    """Restore the options a run was started with, so its cells and schedule come out identical."""
+    if run["finished"]:
+        raise SystemExit(f"Run {run['id']} already finished")
+    if run["workload"] != options.workload:
+        raise SystemExit(f"Run {run['id']} is {run['workload']}, not {options.workload}")
+    for name, value in json.loads(run["options"]).items():
+        if name not in LOCAL_OPTIONS:
+            setattr(options, name, value)
+    return options
+
+
+def now():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def relative_change_ci(baseline, candidate, rng, resamples=RESAMPLES, confidence=CONFIDENCE):
+    """Bootstrap CI of mean(candidate) / mean(baseline) - 1."""
+    baseline = np.asarray(baseline, dtype=float)
+    candidate = np.asarray(candidate, dtype=float)
+    base = rng.choice(baseline, (resamples, len(baseline))).mean(axis=1)
+    cand = rng.choice(candidate, (resamples, len(candidate))).mean(axis=1)
+    ratios = cand / base - 1
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(ratios, [tail, 100 - tail])
+    return float(low), float(high)
+
+
+def compare_runs(store, baseline_id, candidate_id, threshold, seed=42):
+    """Rows (key, base mean, candidate mean, change, ci, verdict) for matching cells."""
+    rng = np.random.default_rng(seed)
+    base, cand = store.samples(baseline_id), store.samples(candidate_id)
+    rows = []
+    for key in sorted(base.keys() & cand.keys()):
+        b, c = base[key], cand[key]
+        change = np.mean(c) / np.mean(b) - 1
+        if len(b) < 2 or len(c) < 2:
+            rows.append((key, np.mean(b), np.mean(c), change, None, "too few samples"))
+            continue
+        low, high = relative_change_ci(b, c, rng)
+        if low > threshold:
+            verdict = "REGRESSION"
+        elif high < -threshold:
+            verdict = "improvement"
+        else:
+            verdict = ""
+        rows.append((key, np.mean(b), np.mean(c), change, (low, high), verdict))
+    return rows
+
+
+def list_runs(options):
+    """`runs` command: one line per stored run."""
+    with ResultsStore(options.results) as store:
+        print(f"{'id':>4}  {'started':<26}{'workload':<22}{'commit':<10}{'backends'}")
+        for run in store.runs():
+            versions = json.loads(run["versions"] or "{}")
+            commit = (run["git_commit"] or "-")[:8] + ("*" if run["git_dirty"] else "")
+            state = "" if run["finished"] else "  (unfinished)"
+            print(f"{run['id']:>4}  {run['started']:<26}{run['workload']:<22}{commit:<10}"
+                  f"{', '.join(versions.values())}{state}")
+
+
+def compare(options):
+    """`compare` command: flag cells that got significantly slower than --baseline."""
+    if options.baseline is None:
+        raise SystemExit("compare needs --baseline RUN_ID (see `python -m benchmark runs`)")
+    with ResultsStore(options.results) as store:
+        baseline = store.run(options.baseline)
+        candidate = (store.run(options.run) if options.run is not None
+                     else store.latest_run(baseline["workload"], baseline["id"]))
+        if candidate["workload"] != baseline["workload"]:
+            raise SystemExit(f"Run {candidate['id']} is {candidate['workload']}, "
+                             f"baseline {baseline['id']} is {baseline['workload']}")
+        rows = compare_runs(store, baseline["id"], candidate["id"], options.threshold, options.seed)
+
+    print(f"{baseline['workload']}: run {candidate['id']} vs baseline {baseline['id']}"
+          f" (threshold {options.threshold:.0%})")
+    for run in (baseline, candidate):
+        print(f"  run {run['id']}: {run['git_commit'] or '-'} {json.loads(run['versions'] or '{}')}")
+    if not rows:
+        print("No cells with raw samples in common.")
+        return
+    print(f"{'cell':<44}{'baseline':>12}{'run':>12}{'change':>10}{'95% CI':>20}  verdict")
+    for (backend, size, variant, metric), b, c, change, ci, verdict in rows:
+        cell = f"{backend} n={size} {variant} {metric}"
+        ci_text = f"[{ci[0]:+.1%}, {ci[1]:+.1%}]" if ci else "-"
+        print(f"{cell:<44}{b:>11.4f}s{c:>11.4f}s{change:>+10.1%}{ci_text:>20}  {verdict}")
+    regressions = sum(1 for row in rows if row[-1] == "REGRESSION")
+    if regressions:
+        raise SystemExit(f"{regressions} significant regression(s)")
@@ -0,0 +1,168 @@
+"""Warmup, repetitions and randomized ordering for size-sweep workloads.
+
+A scheduled workload splits its sweep into cells (backend x size x variant).
+Each cell measures once per call and returns {metric: seconds}. The
+scheduler runs --warmup unrecorded passes of every cell, then
+--repetitions recorded passes. All passes go in one shuffled order across
+every open backend, so drift (caches warming, compaction, a noisy
+neighbour) spreads over all cells instead of landing on one. Samples are
+summarized as mean/median with a bootstrap confidence interval.
+"""
+import random
+
+import numpy as np
+
+from benchmark import profiler
+
+# bootstrap resamples and confidence level
+RESAMPLES = 2_000
+CONFIDENCE = 0.95
+
+
+class Cell:
+    """One point of a sweep; measure(warmup) runs it once and returns {metric: value}."""
+
+    def __init__(self, backend, size, variant, measure):
+        self.backend = backend
+        self.size = size
+        self.variant = variant
+        self.measure = measure
+
+    @property
+    def key(self):
+        return (self.backend.name, self.size, self.variant)
+
+    def __str__(self):
+        return f"{self.backend.label} n={self.size} {self.variant}"
+
+
+def bootstrap_ci(samples, rng, resamples=RESAMPLES, confidence=CONFIDENCE):
+    """Percentile bootstrap confidence interval of the mean."""
+    samples = np.asarray(samples, dtype=float)
+    if len(samples) < 2:
+        return float(samples.mean()), float(samples.mean())
+    means = rng.choice(samples, (resamples, len(samples))).mean(axis=1)
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(means, [tail, 100 - tail])
+    return float(low), float(high)
+
+
+def summarize(samples, rng):
+    low, high = bootstrap_ci(samples, rng)
+    return {
+        "n": len(samples),
+        "mean": float(np.mean(samples)),
+        "median": float(np.median(samples)),
+        "ci_low": low,
+        "ci_high": high,
+    }
+
+
+def run_cells(cells, warmup=1, repetitions=3, seed=42, done=None, record=None, by_size=None):
+    """Run every cell warmup + repetitions times in shuffled order.
+
+    by_size groups the passes of each size together and shuffles only within
+    a size, for workloads whose setup is per size rather than per pass:
+    "shuffled" runs the sizes in a seeded random order, "ascending" from
+    smallest to largest (for workloads that grow one data set).
+
+    The order depends only on the cells and the seed, so a resumed run
+    replays the same schedule. done maps (cell key, repetition) to the
+    metrics of passes recorded earlier; those passes are skipped, and so are
+    the warmups of cells with nothing left to run. record(key, repetition,
+    metrics) is called as soon as each recorded pass finishes.
+
+    Returns {cell.key: {metric: [samples]}} for all recorded passes, old and new.
+    """
+    done = done or {}
+    order = random.Random(seed)
+    samples = {cell.key: {} for cell in cells}
+
+    passes = [(cell, None) for cell in cells for _ in range(warmup)]
+    order.shuffle(passes)
+    recorded = [(cell, rep) for cell in cells for rep in range(repetitions)]
+    order.shuffle(recorded)
+    passes += recorded
+    sizes = sorted({cell.size for cell in cells})
+    if by_size == "shuffled":
+        order.shuffle(sizes)
+    rank = {size: i for i, size in enumerate(sizes)}
+
+    remaining = {cell.key for cell, rep in recorded if (cell.key, rep) not in done}
+    passes = [(cell, rep) for cell, rep in passes
+              if (cell.key, rep) not in done and (rep is not None or cell.key in remaining)]
+    if by_size:
+        # stable, so each size still starts with its warmups
+        passes.sort(key=lambda p: rank[p[0].size])
+    for (key, rep), metrics in sorted(done.items(), key=lambda item: item[0][1]):
+        if key in samples:
+            for metric, value in metrics.items():
+                samples[key].setdefault(metric, []).append(value)
+    if done:
+        print(f"Resuming: {len(done)} recorded passes reused, {len(passes)} passes to run")
+
+    for i, (cell, rep) in enumerate(passes, 1):
+        tag = "warmup" if rep is None else f"run {rep + 1}/{repetitions}"
+        print(f"[{i}/{len(passes)}] {tag}: {cell}")
+        if rep is None:
+            result = cell.measure(True)
+        else:
+            with profiler.section(cell.backend.name, cell.variant):
+                result = cell.measure(False)
+        if rep is not None:
+            for metric, value in result.items():
+                samples[cell.key].setdefault(metric, []).append(value)
+            if record is not None:
+                record(cell.key, rep, result)
+    return samples
+
+
+def summarize_all(samples, seed=42):
+    """{cell key: {metric: summary}} for the output of run_cells()."""
+    rng = np.random.default_rng(seed)
+    return {
+        key: {metric: summarize(values, rng) for metric, values in metrics.items()}
+        for key, metrics in samples.items()
+    }
+
+
+def format_stats(stats, unit="s"):
+    lines = [f"{'cell':<36}{'metric':<20}{'n':>4}{'mean':>12}{'median':>12}{'95% CI':>26}"]
+    for (backend, size, variant), metrics in stats.items():
+        for metric, s in metrics.items():
+            ci = f"[{s['ci_low']:.4f}, {s['ci_high']:.4f}]"
+            lines.append(
+                f"{f'{backend} n={size} {variant}':<36}{metric:<20}{s['n']:>4}"
+                f"{s['mean']:>11.4f}{unit}{s['median']:>11.4f}{unit}{ci:>26}"
+            )
+    return "\n".join(lines)
+
+
+class ScheduledWorkload:
+    """Workload made of cells(backend, options, context) and report(backend, options, stats, context).
+
+    run() takes every open backend at once so their cells can be interleaved.
+    by_size(options), when given, returns run_cells()'s by_size grouping.
+    """
+
+    def __init__(self, cells, report, by_size=None):
+        self.cells = cells
+        self.report = report
+        self.by_size = by_size
+
+    def run(self, backends, options, done=None, record=None):
+        """Run, summarize and report; done/record are passed through to run_cells()."""
+        contexts = {b.name: {} for b in backends}
+        cells = [cell for b in backends for cell in self.cells(b, options, contexts[b.name])]
+        by_size = self.by_size(options) if self.by_size is not None else None
+        samples = run_cells(cells, options.warmup, options.repetitions, options.seed, done, record, by_size)
+        stats = summarize_all(samples, options.seed)
+        print(format_stats(stats))
+        results = {}
+        for b in backends:
+            own = {key: s for key, s in stats.items() if key[0] == b.name}
+            results[b.name] = self.report(b, options, own, contexts[b.name])
+        return {"samples": samples, "stats": stats, "results": results}
+
+    def __call__(self, backend, options):
+        return self.run([backend], options)
@@ -0,0 +1,32 @@
+import time
+
+from benchmark import profiler
+
+
+def timed(fn, *args, **kwargs):
+    """Call fn once and return the elapsed wall time in seconds."""
+    with profiler.region():
+        t0 = time.perf_counter()
+        fn(*args, **kwargs)
+        return time.perf_counter() - t0
+
+
+def timed_each(fn, items, histogram=None):
+    """Call fn(item) for every item and return the total elapsed seconds.
+
+    With a histogram, every call is also timed on its own with
+    perf_counter_ns and recorded into it.
+    """
+    with profiler.region():
+        t0 = time.perf_counter()
+        if histogram is None:
+            for item in items:
+                fn(item)
+        else:
+            clock = time.perf_counter_ns
+            record = histogram.record
+            for item in items:
+                start = clock()
+                fn(item)
+                record(clock() - start)
+        return time.perf_counter() - t0
@@ -0,0 +1,26 @@
+from benchmark.workloads.async_queries import async_queries
+from benchmark.workloads.batch_size import batch_size
+from benchmark.workloads.concurrent_queries import concurrent_queries
+from benchmark.workloads.constraint import constraint
+from benchmark.workloads.data_manipulation import data_manipulation
+from benchmark.workloads.fleet import fleet
+from benchmark.workloads.memory_usage import memory_usage
+from benchmark.workloads.open_loop import open_loop
+from benchmark.workloads.query_optimization import query_optimization
+from benchmark.workloads.streaming import streaming
+from benchmark.workloads.transactions import transactions
+
+# workload name -> fn(backend, options)
+WORKLOADS = {
+    "async_queries": async_queries,
+    "batch_size": batch_size,
+    "concurrent_queries": concurrent_queries,
+    "constraint": constraint,
+    "data_manipulation": data_manipulation,
+    "fleet": fleet,
+    "memory_usage": memory_usage,
+    "open_loop": open_loop,
+    "query_optimization": query_optimization,
+    "streaming": streaming,
+    "transactions": transactions,
+}
@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+from benchmark.backends.base import QUERY_NAMES
+from benchmark.histogram import Histogram, format_table
+from benchmark.plotting import plot_lines
+
+
+async def run_level(backend, names, concurrency, duration):
+    """Keep `concurrency` queries in flight for `duration` seconds.
+
+    Failed queries are only counted in errors, not in latency or throughput.
+    """
+    clock = time.perf_counter_ns
+    latency = Histogram()
+    errors = 0
+    deadline = clock() + int(duration * 1e9)
+
+    async def client(i):
+        nonlocal errors
+        while clock() < deadline:
+            name = names[i % len(names)]
+            i += 1
+            t0 = clock()
+            try:
+                await backend.run_query(name)
+            except Exception:
+                errors += 1
+                continue
+            latency.record(clock() - t0)
+
+    start = clock()
+    await asyncio.gather(*(client(i) for i in range(concurrency)))
+    elapsed = (clock() - start) / 1e9
+    return latency, latency.count / elapsed, errors
+
+
+async def run_levels(backend, options):
+    names = options.queries or QUERY_NAMES
+    await backend.connect()
+    try:
+        results = {}
+        for concurrency in options.async_concurrency:
+            print(f"\nRunning {concurrency} in-flight queries for {options.duration:g} s ...")
+            latency, throughput, errors = await run_level(backend, names, concurrency, options.duration)
+            print(f"Throughput: {throughput:.1f} queries/s, errors: {errors}")
+            print(format_table({f"c={concurrency}": latency, "pool wait": backend.take_pool_wait()}))
+            results[concurrency] = (latency, throughput)
+        return results
+    finally:
+        await backend.close()
+
+
+def async_queries(backend, options):
+    """Shared query set on Motor / asyncpg at concurrency levels into the thousands.
+
+    backend is an unconnected async backend (see ASYNC_WORKLOADS); run_levels() connects it.
+    """
+    results = asyncio.run(run_levels(backend, options))
+
+    levels = list(results)
+    throughput = {"Throughput": [results[c][1] for c in levels]}
+    latency = {f"p{p:g}": [results[c][0].percentile(p) / 1e6 for c in levels] for p in (50, 99)}
+    plot_lines(backend, "async_throughput", levels, throughput,
+               "Async Queries: Throughput vs Concurrency", "Queries in Flight",
+               ylabel="Throughput (queries/s)", size_axis=False)
+    plot_lines(backend, "async_latency", levels, latency,
+               "Async Queries: Latency vs Concurrency", "Queries in Flight",
+               ylabel="Latency (ms)", size_axis=False)
+    return {"async_throughput": throughput, "async_latency": latency}
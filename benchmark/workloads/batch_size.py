@@ -0,0 +1,61 @@
+from benchmark.data import prepared_records
+from benchmark.plotting import plot_panels
+from benchmark.scheduler import Cell, ScheduledWorkload
+from benchmark.timing import timed
+
+TARGET = "benchmark_batch_size"
+
+OPS = ("Insert", "Update", "Delete")
+
+
+def batch_label(batch_size):
+    return "all" if batch_size is None else str(batch_size)
+
+
+def measure(backend, options, size, batch_size, cache=None):
+    """Insert, per-record update and delete of `size` records, batch_size per round trip."""
+    backend.use(TARGET)
+    backend.reset()
+    records = prepared_records(backend, size, options, cache)
+    # "all" is one batch of every record; None would get the backend's default
+    # batching instead (1000-row pages, or one INSERT per row, on CockroachDB)
+    per_batch = batch_size or size
+    result = {"Insert": timed(backend.insert_many, records, per_batch)}
+    # a different value per record, so the update cannot collapse into one update_all
+    updates = [(k, {"helpful_vote": i % 100}) for i, k in enumerate(backend.keys())]
+    result["Update"] = timed(backend.update_batch, updates, per_batch)
+    keys = backend.keys()
+    result["Delete"] = timed(backend.delete_batch, keys, per_batch)
+    print(f"[batch={batch_label(batch_size)}] n={size}: "
+          + ", ".join(f"{op} {size / s:,.0f}/s" for op, s in result.items()))
+    return result
+
+
+def cells(backend, options, context):
+    cache = context["records"] = {}
+    for size in options.sizes:
+        for batch_size in options.write_batch_sizes:
+            yield Cell(backend, size, batch_label(batch_size),
+                       lambda warmup, size=size, batch_size=batch_size:
+                       measure(backend, options, size, batch_size, cache))
+
+
+def report(backend, options, stats, context):
+    backend.use(TARGET)
+    backend.drop()
+
+    labels = [batch_label(b) for b in options.write_batch_sizes]
+    throughput = {op: {} for op in OPS}
+    for size in options.sizes:
+        for op in OPS:
+            throughput[op][f"{size} {backend.unit.lower()}"] = [
+                size / stats[(backend.name, size, label)][op]["mean"] for label in labels
+            ]
+    plot_panels(backend, "batch_size", list(range(len(labels))),
+                {op: (series, f"{backend.unit} / second") for op, series in throughput.items()},
+                "Write Throughput vs Batch Size", "Batch Size", xticklabels=labels)
+    return {"batch_size": {"batch_sizes": labels, "throughput": throughput}}
+
+
+# Insert / bulk update / delete throughput as a function of the client batch size.
+batch_size = ScheduledWorkload(cells, report)
@@ -0,0 +1,45 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmark.backends.base import QUERY_NAMES
+from benchmark.histogram import format_table
+from benchmark.plans import capture
+from benchmark.plotting import plot_lines
+from benchmark.timing import timed
+
+
+def run_concurrently(fns):
+    with ThreadPoolExecutor(max_workers=len(fns)) as executor:
+        list(executor.map(lambda fn: fn(), fns))
+
+
+def concurrent_queries(backend, options):
+    """Wall time for the first `count` queries of the shared set run in parallel, per consistency level."""
+    counts = options.concurrency
+    query_functions = backend.query_functions()
+    series = {}
+    plans = []
+
+    for level in backend.consistency_levels(options.consistency):
+        suffix = "" if level == "default" else f" [{level}]"
+        times = series[f"Response Time{suffix}"] = []
+        waits = series[f"Max Pool Wait{suffix}"] = []
+        with backend.at_consistency(level):
+            for count in counts:
+                print(f"\nRunning {count} concurrent queries ({level})...")
+                backend.take_pool_wait()
+                duration = timed(run_concurrently, query_functions[:count])
+                pool_wait = backend.take_pool_wait()
+                times.append(duration)
+                waits.append(pool_wait.max / 1e9)
+                print(f"Time taken: {duration:.4f} seconds")
+                print(format_table({"pool wait": pool_wait}))
+            if options.explain:
+                plans += capture(backend, QUERY_NAMES, level)
+
+    plot_lines(backend, "concurrent_queries", counts, series,
+               "Concurrent Queries: Time vs Number of Concurrent Queries",
+               "Number of Concurrent Queries", ylabel="Response Time (seconds)", size_axis=False)
+    result = {"concurrent_queries": series}
+    if options.explain:
+        result["plans"] = plans
+    return result
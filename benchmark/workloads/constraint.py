@@ -0,0 +1,52 @@
+from benchmark.data import make_docs
+from benchmark.plotting import plot_lines, stats_series
+from benchmark.scheduler import Cell, ScheduledWorkload
+from benchmark.timing import timed
+
+TARGET = "user_review_integrity_test"
+
+# constraint -> plot label
+SCENARIOS = {
+    "unique": "Unique(user_id)",
+    "check": "Check: rating 1–5",
+    "not_null": "Not Null (all fields)",
+}
+
+
+def measure(backend, options, name, n):
+    """Bulk insert of n records into a target created with one constraint."""
+    backend.use(TARGET)
+    backend.reset(constraint=name)
+    # unique user ids so the unique scenario never violates
+    records = backend.prepare(make_docs(n, unique_users=(name == "unique"), options=options))
+    seconds = timed(backend.insert_many, records)
+    print(f"[{SCENARIOS[name]}] n={n}: {seconds:.4f} s")
+    return {"Insert": seconds}
+
+
+def cells(backend, options, context):
+    for name in SCENARIOS:
+        for n in options.sizes:
+            yield Cell(backend, n, name, lambda warmup, name=name, n=n: measure(backend, options, name, n))
+
+
+def report(backend, options, stats, context):
+    sizes = options.sizes
+    backend.use(TARGET)
+    backend.drop()
+
+    series, ci = {}, {}
+    for name, label in SCENARIOS.items():
+        values, bounds = stats_series(stats, sizes, name, {"Insert": label})
+        series.update(values)
+        ci.update(bounds)
+
+    title = "Constraint: Time vs Data Size"
+    if backend.insert_strategy != backend.INSERT_STRATEGIES[0]:
+        title += f" [{backend.insert_strategy}]"
+    plot_lines(backend, "constraint", sizes, series, title, f"Number of {backend.unit} (inserted)", ci=ci)
+    return {"constraint": series}
+
+
+# Bulk insert cost under a unique index, a rating check and NOT NULL columns.
+constraint = ScheduledWorkload(cells, report)
@@ -0,0 +1,119 @@
+from benchmark.data import prepared_records
+from benchmark.histogram import Histogram, format_table
+from benchmark.plotting import plot_lines, plot_percentiles, stats_series
+from benchmark.scheduler import Cell, ScheduledWorkload
+from benchmark.timing import timed, timed_each
+
+TARGET = "benchmark_collection"
+
+SINGLE_OPS = ("Insert", "Update", "Delete")
+
+
+def measure_batch(backend, options, size, level="default", cache=None):
+    """Bulk insert, update-all and delete-all of `size` records."""
+    backend.use(TARGET)
+    backend.reset()
+    records = prepared_records(backend, size, options, cache)
+    with backend.at_consistency(level):
+        result = {
+            "Insert": timed(backend.insert_many, records),
+            "Update": timed(backend.update_all, {"helpful_vote": 10}),
+            "Delete": timed(backend.delete_all),
+        }
+    for op, seconds in result.items():
+        print(f"[Batch {level}] {op} time: {seconds:.4f} s")
+    return result
+
+
+def measure_single(backend, options, size, hists, mode="text", level="default", cache=None):
+    """One call per record for insert, update and delete, each into a latency histogram."""
+    backend.use(TARGET)
+    backend.reset()
+    records = prepared_records(backend, size, options, cache)
+    changes = {"helpful_vote": 10}
+    backend.statement_mode = mode
+    if mode == "prepared":
+        backend.prepare_single(changes)
+    try:
+        with backend.at_consistency(level):
+            result = {"Insert": timed_each(backend.insert_one, records, hists["Insert"])}
+            keys = backend.keys()
+            result["Update"] = timed_each(lambda k: backend.update_one(k, changes), keys, hists["Update"])
+            keys = backend.keys()
+            result["Delete"] = timed_each(backend.delete_one, keys, hists["Delete"])
+    finally:
+        backend.statement_mode = backend.STATEMENT_MODES[0]
+    for op, seconds in result.items():
+        print(f"[Single {mode} {level}] {op} time: {seconds:.4f} s")
+    return result
+
+
+def variant(kind, mode="text", level="default"):
+    """Cell variant: batch / single / single_prepared, with @level unless default."""
+    name = kind if mode == "text" else f"{kind}_{mode}"
+    return name if level == "default" else f"{name}@{level}"
+
+
+def op_label(op, mode="text", level="default"):
+    label = op if mode == "text" else f"{op} ({mode})"
+    return label if level == "default" else f"{label} [{level}]"
+
+
+def cells(backend, options, context):
+    """A batch cell per consistency level and a single cell per statement mode and level, per size.
+
+    Single-operation latencies merge across recorded passes.
+    """
+    levels = context["levels"] = backend.consistency_levels(options.consistency, writes=True)
+    latencies = context["latencies"] = {}  # size -> {op label: Histogram}
+    cache = context["records"] = {}  # latest size -> prepared records, when the backend can reuse them
+    for size in options.sizes:
+        latencies[size] = {}
+        for level in levels:
+            yield Cell(backend, size, variant("batch", level=level),
+                       lambda warmup, size=size, level=level: measure_batch(backend, options, size, level, cache))
+            for mode in options.statement_modes:
+                hists = {op: Histogram() for op in SINGLE_OPS}
+                latencies[size].update({op_label(op, mode, level): h for op, h in hists.items()})
+
+                def single(warmup, size=size, hists=hists, mode=mode, level=level):
+                    return measure_single(backend, options, size,
+                                          {op: Histogram() for op in SINGLE_OPS} if warmup else hists,
+                                          mode, level, cache)
+
+                yield Cell(backend, size, variant("single", mode, level), single)
+
+
+def report(backend, options, stats, context):
+    sizes = options.sizes
+    backend.use(TARGET)
+    backend.drop()
+
+    unit = backend.unit
+    insert = backend.insert_label()
+    batch, batch_ci, single, single_ci = {}, {}, {}, {}
+    for level in context["levels"]:
+        labels = {"Insert": op_label(insert, level=level), "Update": op_label("Update", level=level),
+                  "Delete": op_label("Delete", level=level)}
+        values, bounds = stats_series(stats, sizes, variant("batch", level=level), labels)
+        batch.update(values)
+        batch_ci.update(bounds)
+        for mode in options.statement_modes:
+            values, bounds = stats_series(stats, sizes, variant("single", mode, level),
+                                          {op: op_label(op, mode, level) for op in SINGLE_OPS})
+            single.update(values)
+            single_ci.update(bounds)
+    plot_lines(backend, "batch_operations", sizes, batch,
+               f"Batch Operations: Time vs Number of {unit}", f"Number of {unit}", ci=batch_ci)
+    plot_lines(backend, "single_operations", sizes, single,
+               f"Single Operations: Time vs Number of {unit}", f"Number of {unit}", ci=single_ci)
+    for size, hists in context["latencies"].items():
+        print(f"\n{backend.label} single-operation latency, {size} {unit.lower()}")
+        print(format_table(hists))
+        plot_percentiles(backend, f"single_latency_{size}", hists,
+                         f"Single Operation Latency, {size} {unit}")
+    return {"batch_operations": batch, "single_operations": single, "single_latency": context["latencies"]}
+
+
+# Batch and single insert/update/delete at every sample size.
+data_manipulation = ScheduledWorkload(cells, report)
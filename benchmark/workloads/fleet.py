@@ -0,0 +1,23 @@
+from benchmark.fleet import run_fleet
+from benchmark.histogram import format_table
+from benchmark.plotting import plot_percentiles
+
+
+def short_name(name):
+    return name.removeprefix("query_")
+
+
+def fleet(backend, options):
+    """Shared query set from a fleet of worker processes; one merged latency report."""
+    print(f"\nStarting {options.processes} processes x {options.threads} threads "
+          f"for {options.duration:g} s ...")
+    result = run_fleet(backend.name, options)
+
+    hists = {short_name(name): h for name, h in result["histograms"].items()}
+    print(f"Throughput: {result['throughput']:.1f} queries/s, errors: {result['errors']}")
+    print(format_table({**hists, "all": result["total"]}))
+    print(format_table({"pool wait": result["pool_wait"]}))
+
+    plot_percentiles(backend, "fleet_latency", hists,
+                     f"Fleet Latency, {options.processes} x {options.threads} Clients")
+    return {"fleet": {"throughput": result["throughput"], "histograms": result["histograms"]}}
@@ -0,0 +1,65 @@
+from benchmark import profiler
+from benchmark.data import make_docs
+from benchmark.plotting import plot_lines, plot_panels
+from benchmark.resources import ResourceCollector
+
+TARGET = "user_review_memory"
+
+PHASES = ("Insert", "Update", "Delete")
+
+
+def run_phase(collector, fn, *args):
+    with collector.phase() as summary, profiler.region():
+        fn(*args)
+    return summary
+
+
+def memory_usage(backend, options):
+    """Client and server resources per insert/update/delete phase at every sample size."""
+    sizes = options.sizes
+    backend.use(TARGET)
+    backend.reset()
+    collector = ResourceCollector(backend, options.sample_interval)
+    phases = {phase: [] for phase in PHASES}  # phase -> summary per size
+
+    for size in sizes:
+        print(f"\n--- Measuring with {size} {backend.unit.lower()} ---")
+        backend.delete_all()
+        records = backend.prepare(make_docs(size, options=options))
+        phases["Insert"].append(run_phase(collector, backend.insert_many, records))
+        phases["Update"].append(run_phase(collector, backend.update_all, {"helpful_vote": 10}))
+        phases["Delete"].append(run_phase(collector, backend.delete_all))
+
+        for phase in PHASES:
+            summary = phases[phase][-1]
+            cells = [f"{k}: {v:.1f} MB" for k, v in summary["memory"].items()]
+            cells += [f"{k}: {v:.0f}%" for k, v in summary["cpu"].items()]
+            cells += [f"{k}: {v:.1f} MB" for k, v in summary["io"].items()]
+            print(f"[{phase}] " + ", ".join(cells))
+
+    backend.drop()
+
+    def series(group, phase_names=PHASES, reduce=max):
+        """{metric: [value per size]} for one group, reduced across the given phases."""
+        out = {}
+        for i in range(len(sizes)):
+            values = {}
+            for phase in phase_names:
+                for k, v in phases[phase][i][group].items():
+                    values.setdefault(k, []).append(v)
+            for k, v in values.items():
+                out.setdefault(k, [0.0] * len(sizes))[i] = reduce(v)
+        return out
+
+    unit = backend.unit
+    memory = series("memory")
+    plot_lines(backend, "memory_usage", sizes, memory,
+               f"Peak Memory Usage vs Number of {unit}", f"Number of {unit}",
+               ylabel="Memory Usage (MB)", size_axis=False)
+    plot_panels(backend, "cpu_usage", sizes,
+                {phase: (series("cpu", [phase]), "CPU (%)") for phase in PHASES},
+                f"CPU per Phase vs Number of {unit}", f"Number of {unit}", size_axis=False)
+    plot_panels(backend, "io_usage", sizes,
+                {phase: (series("io", [phase]), "IO (MB)") for phase in PHASES},
+                f"IO per Phase vs Number of {unit}", f"Number of {unit}", size_axis=False)
+    return {"memory_usage": memory, "phases": phases}
@@ -0,0 +1,45 @@
+from benchmark.backends.base import QUERY_NAMES
+from benchmark.histogram import format_table
+from benchmark.loadgen import run_open_loop, saturated
+from benchmark.plans import capture
+from benchmark.plotting import plot_lines
+
+# percentiles plotted against throughput
+CURVE = (50, 99, 99.9)
+
+
+def open_loop(backend, options):
+    """Step a fixed-rate query mix up until saturation; plot throughput vs latency."""
+    query_functions = backend.query_functions(options.queries)
+    throughput = []
+    series = {f"p{p:g}": [] for p in CURVE}
+    sustainable = None
+
+    for rate in options.rates:
+        print(f"\nOffering {rate:g} queries/s for {options.duration:g} s ...")
+        backend.take_pool_wait()
+        result = run_open_loop(query_functions, rate, options.duration, options.max_in_flight)
+        latency = result["latency"]
+        throughput.append(result["throughput"])
+        for p in CURVE:
+            series[f"p{p:g}"].append(latency.percentile(p) / 1e6)
+        print(
+            f"Throughput: {result['throughput']:.1f}/s, "
+            + ", ".join(f"p{p:g}: {latency.percentile(p) / 1e6:.1f} ms" for p in CURVE)
+            + f", service p50: {result['service'].percentile(50) / 1e6:.1f} ms"
+            + f", errors: {result['errors']}"
+        )
+        print(format_table({"pool wait": backend.take_pool_wait()}))
+        if saturated(result, options.slo_ms):
+            print(f"Saturated at {rate:g} queries/s")
+            break
+        sustainable = rate
+
+    print(f"\nSustainable rate ({backend.label}): {sustainable or 'below the lowest rate'} queries/s")
+    plot_lines(backend, "open_loop", throughput, series,
+               "Open Loop: Latency vs Throughput", "Throughput (queries/s)",
+               ylabel="Latency (ms)", size_axis=False)
+    result = {"open_loop": {"throughput": throughput, **series, "sustainable": sustainable}}
+    if options.explain:
+        result["plans"] = capture(backend, options.queries or QUERY_NAMES)
+    return result
@@ -0,0 +1,149 @@
+import time
+
+from benchmark.config import MATCH_FRACTION, SOURCE, TARGET_USER
+from benchmark.plans import describe
+from benchmark.plotting import plot_lines, stats_series
+from benchmark.resources import MB, ResourceCollector
+from benchmark.scheduler import Cell, ScheduledWorkload
+from benchmark.timing import timed
+
+TARGET = "user_review_qopt"
+
+# variant -> plot label
+VARIANTS = {"no_index": "Update w/o index", "index": "Update with index"}
+
+
+def marked(n):
+    return max(1, int(n * MATCH_FRACTION))
+
+
+def prepare_subset(backend, n):
+    """Clone first n source records into the target, all verified, and mark ~1% as TARGET_USER."""
+    backend.clone_source(n, {"verified_purchase": True})
+    backend.mark_first(marked(n), {"user_id": TARGET_USER})
+
+
+def grow_subset(backend, have, n):
+    """Append source records have..n to the target and extend the TARGET_USER marking to marked(n).
+
+    Only the delta moves: the new records are copied already verified, and
+    the records between the old and new marking bound get TARGET_USER.
+    """
+    if not have:
+        backend.reset()
+    backend.append_source(n - have, {"verified_purchase": True})
+    if backend.count() != n:
+        raise RuntimeError(f"{SOURCE} has fewer than {n} records to grow {TARGET} to.")
+    done = marked(have) if have else 0
+    if marked(n) > done:
+        backend.mark_first(marked(n) - done, {"user_id": TARGET_USER}, offset=done)
+
+
+def subset_ready(backend, n):
+    """Whether the target already holds the n-record subset, e.g. left behind by an interrupted run."""
+    return backend.count() == n and backend.count({"user_id": TARGET_USER}) == marked(n)
+
+
+def time_update(backend, with_index):
+    """Time the TARGET_USER update with/without an index on user_id."""
+    backend.drop_indexes()
+    if with_index:
+        backend.create_index("user_id")
+    # reset targeted records to True so the update flips them to False; this
+    # also pulls the fresh index into cache before the timed statement
+    backend.update_where("user_id", TARGET_USER, {"verified_purchase": True})
+    return timed(backend.update_where, "user_id", TARGET_USER, {"verified_purchase": False})
+
+
+def explain(backend, n, variant, context):
+    """Capture the plan of the timed update once per cell."""
+    plans = context.setdefault("plans", {})
+    if (n, variant) not in plans:
+        plan = backend.explain_update_where("user_id", TARGET_USER, {"verified_purchase": False})
+        plans[(n, variant)] = describe(plan, "update_where user_id", variant, n)
+
+
+def setup(backend, options, n, context):
+    """Build the n-record subset and record its time and client memory, apart from the measured update.
+
+    Passes are grouped by size, so the subset is built once per size and
+    only rebuilt when the size changes. At the start of a --resume run, a target that already has the
+    subset is reused; a fresh run always rebuilds it. With --growth sizes ascend and each step appends to the
+    previous subset; a growth run always starts from an empty target, since
+    appending needs a target that is a prefix of the source.
+    """
+    prepared = context.get("prepared")
+    if prepared == n:
+        return
+    if prepared is None and options.resume is not None and not options.growth and subset_ready(backend, n):
+        print(f"\n--- Reusing subset already in {TARGET}: {n} {backend.unit.lower()} ---")
+        context["prepared"] = n
+        return
+    if "collector" not in context:
+        context["collector"] = ResourceCollector(backend, options.sample_interval)
+    collector = context["collector"]
+    # records already in place that a growth step keeps
+    have = prepared or 0
+    grow = options.growth and have < n
+    start = collector.client.memory_info().rss / MB
+    t0 = time.perf_counter()
+    with collector.phase() as summary:
+        if grow:
+            print(f"\n--- Growing subset: {have} -> {n} {backend.unit.lower()} ---")
+            grow_subset(backend, have, n)
+        else:
+            print(f"\n--- Preparing subset: {n} {backend.unit.lower()} ---")
+            prepare_subset(backend, n)
+    seconds = time.perf_counter() - t0
+    peak = summary["memory"]["Client RSS"]
+    context.setdefault("setup", []).append(
+        {"size": n, "from": have if grow else 0, "seconds": seconds,
+         "client_peak_mb": peak, "client_growth_mb": peak - start}
+    )
+    print(f"  setup: {seconds:.3f}s, client RSS peak {peak:.1f} MB (+{peak - start:.1f} MB)")
+    context["prepared"] = n
+
+
+def measure(backend, options, n, variant, context, warmup=False):
+    backend.use(TARGET)
+    setup(backend, options, n, context)
+    seconds = time_update(backend, with_index=(variant == "index"))
+    print(f"  {VARIANTS[variant]} (n={n}): {seconds:.6f}s")
+    if options.explain and not warmup:
+        explain(backend, n, variant, context)
+    return {"Update": seconds}
+
+
+def cells(backend, options, context):
+    for n in options.sizes:
+        for variant in VARIANTS:
+            yield Cell(backend, n, variant,
+                       lambda warmup, n=n, variant=variant: measure(backend, options, n, variant, context, warmup))
+
+
+def report(backend, options, stats, context):
+    sizes = options.sizes
+    series, ci = {}, {}
+    for variant, label in VARIANTS.items():
+        values, bounds = stats_series(stats, sizes, variant, {"Update": label})
+        series.update(values)
+        ci.update(bounds)
+    plot_lines(backend, "query_optimization", sizes, series,
+               f"Query Optimization: Time Vs Number of {backend.unit}", f"Number of {backend.unit}", ci=ci)
+    steps = context.get("setup", [])
+    if steps:
+        print(f"\n{backend.label} subset setup, not part of the measured update:")
+        for step in steps:
+            print(f"  n={step['size']} (from {step['from']}): {step['seconds']:.3f}s, "
+                  f"client RSS peak {step['client_peak_mb']:.1f} MB (+{step['client_growth_mb']:.1f} MB)")
+    result = {"query_optimization": series, "setup": steps}
+    if options.explain:
+        result["plans"] = list(context.get("plans", {}).values())
+    return result
+
+
+# Update by user_id with and without a secondary index.
+# The subset is built per size, so passes are grouped by size.
+query_optimization = ScheduledWorkload(
+    cells, report, by_size=lambda options: "ascending" if options.growth else "shuffled"
+)
@@ -0,0 +1,70 @@
+import time
+import tracemalloc
+
+from benchmark import profiler
+from benchmark.backends.base import READ_QUERY_NAMES
+from benchmark.plans import capture
+from benchmark.plotting import plot_panels
+
+MB = 1024 * 1024
+
+
+def consume(backend, name, batch_size):
+    """Drain one query; return (time to first record, total time, records)."""
+    with profiler.region():
+        t0 = time.perf_counter()
+        first = None
+        n = 0
+        for _ in backend.iter_query(name, batch_size):
+            if first is None:
+                first = time.perf_counter() - t0
+            n += 1
+        total = time.perf_counter() - t0
+    return (first if first is not None else total), total, n
+
+
+def peak_memory(backend, name, batch_size):
+    """Peak Python allocations (MB) while draining one query.
+
+    Run separately from the timed pass because tracemalloc slows every allocation.
+    """
+    tracemalloc.start()
+    try:
+        for _ in backend.iter_query(name, batch_size):
+            pass
+        return tracemalloc.get_traced_memory()[1] / MB
+    finally:
+        tracemalloc.stop()
+
+
+def streaming(backend, options):
+    """Materialize-everything vs streaming cursors: time to first record, scan time, peak memory."""
+    names = [n for n in options.queries or READ_QUERY_NAMES if n in READ_QUERY_NAMES]
+    modes = [None, *options.batch_sizes]
+    labels = ["all" if m is None else str(m) for m in modes]
+    ttfr = {n: [] for n in names}
+    total = {n: [] for n in names}
+    memory = {n: [] for n in names}
+
+    for name in names:
+        print(f"\n--- {name} ---")
+        for mode, label in zip(modes, labels):
+            first, elapsed, n = consume(backend, name, mode)
+            peak = peak_memory(backend, name, mode)
+            ttfr[name].append(first)
+            total[name].append(elapsed)
+            memory[name].append(peak)
+            kind = "materialize" if mode is None else f"stream batch={label}"
+            print(f"[{kind}] {n} {backend.unit.lower()}, first: {first:.4f} s, "
+                  f"total: {elapsed:.4f} s, peak memory: {peak:.1f} MB")
+
+    x = list(range(len(modes)))
+    plot_panels(backend, "streaming", x, {
+        "Time to First Record": (ttfr, "Time (seconds)"),
+        "Total Scan Time": (total, "Time (seconds)"),
+        "Peak Client Memory": (memory, "Memory (MB)"),
+    }, "Materialize vs Streaming Cursor", "Cursor Batch Size", xticklabels=labels)
+    result = {"streaming": {"modes": labels, "ttfr": ttfr, "total": total, "memory": memory}}
+    if options.explain:
+        result["plans"] = capture(backend, names)
+    return result
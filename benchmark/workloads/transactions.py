@@ -0,0 +1,45 @@
+from benchmark.contention import run_contention
+from benchmark.data import make_docs
+from benchmark.histogram import format_table
+from benchmark.plotting import plot_panels
+
+TARGET = "user_review_txn"
+
+
+def transactions(backend, options):
+    """Read-modify-write transactions on a hot key set of shrinking size, with client retries."""
+    size = max(options.sizes)
+    backend.use(TARGET)
+    backend.reset()
+    backend.insert_many(backend.prepare(make_docs(size, options=options)))
+    keys = backend.keys()
+
+    levels = [h for h in options.hot_keys if h <= len(keys)]
+    runs = {}
+    for hot_keys in levels:
+        print(f"\n{options.threads} clients, {options.txn_keys} keys/txn, hot set {hot_keys} "
+              f"({options.hot_fraction:.0%} of txns) for {options.duration:g} s ...")
+        result = run_contention(backend, keys, hot_keys, options)
+        runs[hot_keys] = result
+        print(f"Committed: {result['committed']} ({result['tps']:.1f} TPS), "
+              f"aborted: {result['aborted']} ({result['abort_rate']:.1%}), "
+              f"retried attempts: {result['retry_rate']:.1%}, errors: {result['errors']}")
+        if result["first_error"]:
+            print(f"First error: {result['first_error']}")
+        print(format_table({f"hot={hot_keys}": result["latency"], "pool wait": backend.take_pool_wait()}))
+
+    backend.drop()
+
+    tps = {"Committed TPS": [runs[h]["tps"] for h in levels]}
+    rates = {
+        "Retry rate (%)": [runs[h]["retry_rate"] * 100 for h in levels],
+        "Abort rate (%)": [runs[h]["abort_rate"] * 100 for h in levels],
+    }
+    latency = {f"p{p:g}": [runs[h]["latency"].percentile(p) / 1e6 for h in levels] for p in (50, 99)}
+    x = list(range(len(levels)))
+    plot_panels(backend, "transactions", x, {
+        "Throughput": (tps, "Transactions / second"),
+        "Conflicts": (rates, "Percent"),
+        "Latency incl. retries": (latency, "Latency (ms)"),
+    }, "Transactions under Contention", "Hot Keys", xticklabels=[str(h) for h in levels])
+    return {"transactions": {"hot_keys": levels, "runs": [runs[h] for h in levels]}}
@@ -0,0 +1,40 @@
+from benchmark.backends.cockroachdb import CopyStream, copy_value
+
+ROWS = [
+    ("plain", 5, True, None),
+    ("tab\there", 0, False, "line\nbreak"),
+    ("back\\slash", -1, None, "cr\rend"),
+]
+EXPECTED = (
+    "plain\t5\tt\t\\N\n"
+    "tab\\there\t0\tf\tline\\nbreak\n"
+    "back\\\\slash\t-1\t\\N\tcr\\rend\n"
+)
+
+
+def test_copy_value_escapes():
+    assert copy_value(None) == r"\N"
+    assert copy_value(True) == "t"
+    assert copy_value(False) == "f"
+    assert copy_value(3) == "3"
+    assert copy_value("a\\b\tc\nd\re") == "a\\\\b\\tc\\nd\\re"
+    # a literal backslash-N is data, not NULL
+    assert copy_value("\\N") == "\\\\N"
+
+
+def test_read_all():
+    assert CopyStream(ROWS).read() == EXPECTED
+
+
+def test_read_in_blocks():
+    for size in (1, 3, 7, 64):
+        stream = CopyStream(ROWS)
+        blocks = iter(lambda: stream.read(size), "")
+        chunks = list(blocks)
+        assert all(len(c) <= size for c in chunks)
+        assert "".join(chunks) == EXPECTED
+
+
+def test_empty():
+    assert CopyStream([]).read() == ""
+    assert CopyStream([]).read(10) == ""
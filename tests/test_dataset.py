@@ -0,0 +1,67 @@
+import csv
+
+import pytest
+
+from benchmark import config, dataset
+from benchmark.loader import clean_doc
+
+ROWS = [
+    {"rating": "5", "title": "Cute", "text": "fits well", "asin": "B01", "parent_asin": "B01",
+     "user_id": "U1", "timestamp": "2021-01-01 10:00:00", "helpful_vote": "2", "verified_purchase": "True"},
+    {"rating": "3.0", "title": "", "text": "tab\\tand, comma", "asin": "B02", "parent_asin": "B09",
+     "user_id": "U2", "timestamp": "2022-05-06 00:00:00", "helpful_vote": "", "verified_purchase": "false"},
+    {"rating": "", "title": "Ok", "text": "", "asin": "B03", "parent_asin": "B03",
+     "user_id": "U1", "timestamp": "", "helpful_vote": "0", "verified_purchase": ""},
+]
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    monkeypatch.setattr(dataset, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(dataset, "INDEX", tmp_path / "cache" / "index.json")
+    # several record batches even for three rows
+    monkeypatch.setattr(dataset, "BATCH_ROWS", 2)
+    path = tmp_path / "reviews.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=config.FIELDS)
+        writer.writeheader()
+        writer.writerows(ROWS)
+    return path
+
+
+def test_round_trip(source):
+    assert dataset.cached(source) is None
+    docs = [doc for chunk in dataset.iter_docs(source, 2) for doc in chunk]
+    assert docs == [clean_doc(r) for r in ROWS]
+    assert dataset.cached(source) == dataset.cache_path(source)
+    assert dataset.read_column(source, "rating").to_pylist() == [5, 3, None]
+
+
+def test_chunk_sizes(source):
+    assert [len(chunk) for chunk in dataset.iter_docs(source, 2)] == [2, 1]
+    assert [len(chunk) for chunk in dataset.iter_docs(source, 5)] == [3]
+
+
+def test_converted_once(source):
+    target = dataset.convert(source)
+    written = target.stat().st_mtime_ns
+    assert dataset.convert(source) == target
+    assert target.stat().st_mtime_ns == written
+
+
+def test_changed_source_gets_a_new_cache(source):
+    first = dataset.convert(source)
+    with open(source, "a", newline="", encoding="utf-8") as f:
+        csv.DictWriter(f, fieldnames=config.FIELDS).writerow(ROWS[0])
+    second = dataset.convert(source)
+    assert second != first
+    assert sum(len(chunk) for chunk in dataset.iter_docs(source)) == 4
+
+
+def test_failed_conversion_leaves_no_file(source):
+    with open(source, "a", newline="", encoding="utf-8") as f:
+        csv.DictWriter(f, fieldnames=config.FIELDS).writerow({**ROWS[0], "rating": "five"})
+    with pytest.raises(ValueError):
+        dataset.convert(source)
+    assert not list(dataset.CACHE_DIR.glob("*.tmp"))
+    assert dataset.cached(source) is None
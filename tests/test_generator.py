@@ -0,0 +1,70 @@
+from collections import Counter
+
+import numpy as np
+
+from benchmark import config
+from benchmark.generator import FALLBACK_RATINGS, DocGenerator, zipf_cdf
+
+
+def generator(seed=42, **kwargs):
+    # explicit rating weights, so the tests do not depend on a converted dataset
+    return DocGenerator(seed=seed, rating_weights=FALLBACK_RATINGS, **kwargs)
+
+
+def test_same_seed_same_docs():
+    assert generator(7).docs(200) == generator(7).docs(200)
+    assert generator(7).docs(200) != generator(8).docs(200)
+
+
+def test_chunks_are_a_seeded_stream():
+    chunks = list(generator(3).chunks(250, 100))
+    assert [len(c) for c in chunks] == [100, 100, 50]
+    assert chunks == list(generator(3).chunks(250, 100))
+
+
+def test_doc_fields():
+    for doc in generator().docs(50):
+        assert tuple(doc) == config.FIELDS
+        assert 1 <= doc["rating"] <= 5
+        assert doc["helpful_vote"] >= 0
+        assert isinstance(doc["verified_purchase"], bool)
+        assert len(doc["user_id"]) == 28
+        assert doc["asin"].startswith("B0") and len(doc["asin"]) == 10
+
+
+def test_unique_users_continue_across_chunks():
+    users = [d["user_id"] for chunk in generator().chunks(25, 10, unique_users=True) for d in chunk]
+    assert users == [f"USER{i}" for i in range(1, 26)]
+
+
+def test_zipf_cdf():
+    cdf = zipf_cdf(1000, 1.1)
+    assert np.all(np.diff(cdf) > 0)
+    assert cdf[-1] == 1.0
+    harmonic = np.sum(1.0 / np.arange(1, 1001) ** 1.1)
+    assert np.isclose(cdf[0], 1 / harmonic)
+
+
+def test_user_ids_follow_zipf():
+    gen = generator(users=1000, zipf=1.1)
+    n = 50_000
+    counts = Counter(d["user_id"] for d in gen.docs(n))
+    ranked = [counts[u] for u in gen.user_ids.astype(str)]
+    # rank 1 is the hottest id and gets about its Zipf share
+    assert counts.most_common(1)[0][0] == gen.user_ids[0].decode()
+    assert abs(ranked[0] / n - zipf_cdf(1000, 1.1)[0]) < 0.01
+    # frequency falls with rank, roughly as rank ** -s
+    assert ranked[0] > ranked[9] > ranked[99]
+    assert 0.5 < (ranked[0] / ranked[9]) / 10 ** 1.1 < 2
+
+
+def test_rating_weights():
+    ratings = Counter(d["rating"] for d in generator().docs(20_000))
+    shares = [ratings[r] / 20_000 for r in range(1, 6)]
+    assert np.allclose(shares, FALLBACK_RATINGS, atol=0.02)
+
+
+def test_same_parent_ratio():
+    docs = generator(same_parent_ratio=0.6).docs(10_000)
+    share = sum(d["asin"] == d["parent_asin"] for d in docs) / len(docs)
+    assert 0.57 < share < 0.66
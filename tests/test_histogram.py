@@ -0,0 +1,52 @@
+import math
+
+from benchmark.histogram import HALF, Histogram
+
+
+def test_small_values_are_exact():
+    h = Histogram()
+    for v in range(256):
+        h.record(v)
+    assert h.percentile(50) == 127
+    assert h.percentile(100) == 255
+    assert h.min == 0 and h.max == 255
+
+
+def test_percentiles_within_bucket_precision():
+    h = Histogram()
+    values = [v * 1000 for v in range(1, 100_001)]  # 1 us .. 100 ms
+    for v in values:
+        h.record(v)
+    for p in (50, 95, 99, 99.9):
+        exact = values[math.ceil(len(values) * p / 100) - 1]
+        assert abs(h.percentile(p) - exact) <= exact / HALF
+    assert h.count == len(values)
+    assert h.mean() == sum(values) / len(values)
+
+
+def test_empty():
+    h = Histogram()
+    assert h.percentile(99) == 0
+    assert h.mean() == 0.0
+
+
+def test_merge_adds_counts():
+    a, b = Histogram(), Histogram()
+    for v in (10, 2_000, 30_000):
+        a.record(v)
+    for v in (5, 1_000_000):
+        b.record(v)
+    a.merge(b)
+    assert a.count == 5
+    assert a.min == 5 and a.max == 1_000_000
+    assert a.percentile(100) == 1_000_000
+
+
+def test_dict_round_trip():
+    h = Histogram()
+    for v in (3, 700, 45_000, 12_345_678):
+        h.record(v)
+    back = Histogram.from_dict(h.to_dict())
+    assert back.counts == h.counts
+    assert (back.count, back.total, back.min, back.max) == (h.count, h.total, h.min, h.max)
+    assert back.percentiles() == h.percentiles()
@@ -0,0 +1,49 @@
+import itertools
+import time
+
+from benchmark.histogram import Histogram
+from benchmark.loadgen import run_open_loop, saturated
+
+
+def test_latency_counts_time_queued_behind_a_stall():
+    calls = itertools.count()
+
+    def fn():
+        if next(calls) == 0:
+            time.sleep(0.2)
+
+    # one client thread, so every request scheduled during the stall waits for it
+    result = run_open_loop([fn], rate=100, duration=0.5, max_in_flight=1)
+    assert result["requests"] == 50
+    assert result["latency"].count == result["service"].count == 50
+    assert result["latency"].max >= 0.2e9
+    # ~15 of 50 requests waited over 50 ms; their service time stays tiny
+    assert result["latency"].percentile(80) > 40e6
+    assert result["service"].percentile(80) < 40e6
+
+
+def test_failures_left_out_of_latency_and_throughput():
+    calls = itertools.count()
+
+    def fn():
+        if next(calls) % 2:
+            raise ValueError("boom")
+
+    result = run_open_loop([fn], rate=200, duration=0.25)
+    assert result["requests"] == 50
+    assert result["errors"] == 25
+    assert result["latency"].count == result["service"].count == 25
+    assert result["throughput"] <= 25 / 0.25 * 1.05
+
+
+def fake_result(throughput=100.0, errors=0, p99_ms=1.0):
+    latency = Histogram()
+    latency.record(p99_ms * 1e6)
+    return {"rate": 100.0, "throughput": throughput, "errors": errors, "latency": latency}
+
+
+def test_saturated():
+    assert not saturated(fake_result(), slo_ms=10)
+    assert saturated(fake_result(throughput=90.0), slo_ms=10)
+    assert saturated(fake_result(p99_ms=20), slo_ms=10)
+    assert saturated(fake_result(errors=1), slo_ms=10)
@@ -0,0 +1,113 @@
+from benchmark import plans
+from benchmark.backends import cockroachdb, mongodb
+
+CRDB_FULL_SCAN = """planning time: 1ms
+execution time: 12ms
+distribution: local
+vectorized: true
+rows decoded from KV: 100,000 (12 MiB, 1 gRPC calls)
+maximum memory usage: 10 MiB
+
+• filter
+│ nodes: n1
+│ actual row count: 512
+│ filter: rating = 5
+│
+└── • scan
+      nodes: n1
+      actual row count: 100,000
+      KV rows decoded: 100,000
+      table: user_review@user_review_pkey
+      spans: FULL SCAN""".splitlines()
+
+CRDB_INDEX_SCAN = """planning time: 300µs
+execution time: 850µs
+rows read from KV: 7 (1.2 KiB, 1 gRPC calls)
+
+• index join
+│ actual row count: 7
+│ table: user_review@user_review_pkey
+│
+└── • scan
+      actual row count: 7
+      table: user_review@idx_user_id
+      spans: [/'U1' - /'U1']""".splitlines()
+
+
+def mongo_explain(winning_plan, **stats):
+    return {"queryPlanner": {"winningPlan": winning_plan}, "executionStats": stats}
+
+
+def test_cockroachdb_full_scan():
+    plan = cockroachdb.summarize_explain(CRDB_FULL_SCAN)
+    assert plan["plan"] == ["filter", "scan"]
+    assert plan["indexes"] == ["user_review_pkey"]
+    assert plan["full_scan"] is True
+    assert plan["rows_read"] == 100_000
+    assert plan["returned"] == 512
+    assert plan["time_ms"] == 12.0
+    assert plan["keys_examined"] is None and plan["docs_examined"] is None
+    assert plans.flagged(plan)
+
+
+def test_cockroachdb_index_scan():
+    plan = cockroachdb.summarize_explain(CRDB_INDEX_SCAN)
+    assert plan["plan"] == ["index join", "scan"]
+    assert plan["indexes"] == ["user_review_pkey", "idx_user_id"]
+    assert plan["full_scan"] is False
+    assert plan["rows_read"] == 7
+    assert plan["time_ms"] == 0.85
+    assert not plans.flagged(plan)
+
+
+def test_cockroachdb_missing_fields():
+    plan = cockroachdb.summarize_explain(["• values"])
+    assert plan["plan"] == ["values"]
+    assert plan["rows_read"] is None and plan["returned"] is None and plan["time_ms"] is None
+
+
+def test_mongodb_collscan():
+    out = mongo_explain(
+        {"stage": "COLLSCAN", "filter": {"rating": {"$eq": 5}}},
+        nReturned=40, totalKeysExamined=0, totalDocsExamined=1000, executionTimeMillis=3,
+        executionStages={"stage": "COLLSCAN", "nReturned": 40},
+    )
+    plan = mongodb.summarize_explain(out)
+    assert plan["plan"] == ["COLLSCAN"]
+    assert plan["indexes"] == []
+    assert plan["full_scan"] is True
+    assert (plan["keys_examined"], plan["docs_examined"], plan["returned"]) == (0, 1000, 40)
+    assert plan["time_ms"] == 3
+    assert plans.flagged(plan)
+
+
+def test_mongodb_update_counts_matched():
+    out = mongo_explain(
+        {"stage": "UPDATE",
+         "inputStage": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "user_id_1"}}},
+        nReturned=0, totalKeysExamined=12, totalDocsExamined=12, executionTimeMillis=1,
+        executionStages={"stage": "UPDATE", "nMatched": 12},
+    )
+    plan = mongodb.summarize_explain(out)
+    assert plan["plan"] == ["UPDATE", "FETCH", "IXSCAN"]
+    assert plan["indexes"] == ["user_id_1"]
+    assert plan["full_scan"] is False
+    assert plan["returned"] == 12
+    assert not plans.flagged(plan)
+
+
+def test_mongodb_nested_query_plan():
+    # newer servers nest the plan tree under queryPlan
+    out = mongo_explain({"isCached": False, "queryPlan": {"stage": "OR", "inputStages": [
+        {"stage": "COLLSCAN"}, {"stage": "IXSCAN", "indexName": "text_1"}]}}, executionStages={})
+    plan = mongodb.summarize_explain(out)
+    assert plan["plan"] == ["OR", "COLLSCAN", "IXSCAN"]
+    assert plan["full_scan"] is True
+
+
+def test_flagged_threshold():
+    scan = {"full_scan": True, "docs_examined": 1000}
+    assert plans.flagged({**scan, "returned": 100})
+    assert not plans.flagged({**scan, "returned": 101})
+    assert not plans.flagged({"full_scan": False, "docs_examined": 1000, "returned": 1})
+    assert plans.examined({"keys_examined": 5, "rows_read": 9}) == 9
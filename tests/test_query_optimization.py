@@ -0,0 +1,78 @@
+import pytest
+
+from benchmark.config import TARGET_USER
+from benchmark.workloads.query_optimization import grow_subset, marked, prepare_subset, subset_ready
+
+
+class MemoryBackend:
+    """The setup calls of Backend on a list of dicts; keys are list positions in the source."""
+
+    def __init__(self, n):
+        self.source = [{"_id": i, "user_id": f"U{i}", "verified_purchase": False} for i in range(n)]
+        self.target = []
+
+    def reset(self):
+        self.target = []
+
+    def clone_source(self, n, changes=None):
+        self.target = [{**doc, **(changes or {})} for doc in self.source[:n]]
+
+    def append_source(self, n, changes=None):
+        last = self.target[-1]["_id"] if self.target else -1
+        following = [doc for doc in self.source if doc["_id"] > last][:n]
+        self.target += [{**doc, **(changes or {})} for doc in following]
+
+    def mark_first(self, k, changes, offset=0):
+        for doc in sorted(self.target, key=lambda d: d["_id"])[offset:offset + k]:
+            doc.update(changes)
+
+    def count(self, where=None):
+        return sum(all(doc.get(f) == v for f, v in (where or {}).items()) for doc in self.target)
+
+
+def test_marked():
+    assert marked(50) == 1
+    assert marked(1000) == 10
+    assert marked(2999) == 29
+
+
+def test_prepare_subset():
+    backend = MemoryBackend(3000)
+    prepare_subset(backend, 1000)
+    assert backend.count() == 1000
+    assert backend.count({"verified_purchase": True}) == 1000
+    assert backend.count({"user_id": TARGET_USER}) == marked(1000)
+    assert subset_ready(backend, 1000)
+    assert not subset_ready(backend, 999)
+
+
+def test_growth_matches_a_fresh_subset():
+    backend = MemoryBackend(3000)
+    have = 0
+    for n in (150, 1000, 2999):
+        grow_subset(backend, have, n)
+        have = n
+        assert subset_ready(backend, n)
+        fresh = MemoryBackend(3000)
+        prepare_subset(fresh, n)
+        assert backend.target == fresh.target
+
+
+def test_growth_from_scratch_resets_the_target():
+    backend = MemoryBackend(500)
+    backend.target = [{"_id": 400, "user_id": "stale", "verified_purchase": False}]
+    grow_subset(backend, 0, 200)
+    assert [doc["_id"] for doc in backend.target] == list(range(200))
+
+
+def test_growth_past_the_source():
+    backend = MemoryBackend(100)
+    with pytest.raises(RuntimeError):
+        grow_subset(backend, 0, 150)
+
+
+def test_subset_ready_checks_the_marking():
+    backend = MemoryBackend(1000)
+    prepare_subset(backend, 1000)
+    backend.target[0]["user_id"] = "someone else"
+    assert not subset_ready(backend, 1000)
@@ -0,0 +1,11 @@
+import re
+
+from benchmark import config
+from benchmark.workloads import WORKLOADS
+
+
+def test_readme_lists_every_workload():
+    text = (config.ROOT / "README.md").read_text(encoding="utf-8")
+    line = next(line for line in text.splitlines() if line.startswith("Available workloads"))
+    listed = line.split(":", 1)[1].split(".")[0]
+    assert set(re.findall(r"`(\w+)`", listed)) == set(WORKLOADS)
@@ -0,0 +1,49 @@
+from benchmark.results import compare_runs
+
+BASELINE = [1.00, 1.02, 0.98, 1.01, 0.99, 1.00]
+
+
+class Store:
+    """Just the samples() part of ResultsStore."""
+
+    def __init__(self, runs):
+        self.runs = runs
+
+    def samples(self, run_id):
+        return self.runs[run_id]
+
+
+def verdicts(candidate, threshold=0.05):
+    key = ("mongodb", 1000, "batch", "Insert")
+    store = Store({1: {key: BASELINE}, 2: {key: candidate}})
+    [(row_key, base, cand, change, ci, verdict)] = compare_runs(store, 1, 2, threshold)
+    assert row_key == key
+    return verdict, ci
+
+
+def test_regression_flagged():
+    verdict, (low, high) = verdicts([v * 1.5 for v in BASELINE])
+    assert verdict == "REGRESSION"
+    assert 0.05 < low <= high
+
+
+def test_improvement_flagged():
+    verdict, _ = verdicts([v * 0.5 for v in BASELINE])
+    assert verdict == "improvement"
+
+
+def test_noise_within_threshold_not_flagged():
+    verdict, (low, high) = verdicts([1.01, 0.99, 1.00, 1.02, 0.98, 1.01])
+    assert verdict == ""
+    assert low < 0 < high
+
+
+def test_too_few_samples():
+    verdict, ci = verdicts([3.0])
+    assert verdict == "too few samples"
+    assert ci is None
+
+
+def test_only_matching_cells_compared():
+    store = Store({1: {("a", 1, "x", "m"): BASELINE}, 2: {("a", 2, "x", "m"): BASELINE}})
+    assert compare_runs(store, 1, 2, 0.05) == []
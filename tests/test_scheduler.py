@@ -0,0 +1,117 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from benchmark.scheduler import Cell, bootstrap_ci, run_cells, summarize
+
+
+def test_bootstrap_ci_brackets_the_mean():
+    samples = np.random.default_rng(1).normal(10.0, 1.0, 50)
+    low, high = bootstrap_ci(samples, np.random.default_rng(0))
+    assert low < samples.mean() < high
+    assert 9.0 < low and high < 11.0
+
+
+def test_bootstrap_ci_is_seeded():
+    samples = [1.0, 1.2, 0.9, 1.1, 1.05]
+    assert bootstrap_ci(samples, np.random.default_rng(7)) == bootstrap_ci(samples, np.random.default_rng(7))
+
+
+def test_bootstrap_ci_single_sample():
+    assert bootstrap_ci([2.5], np.random.default_rng(0)) == (2.5, 2.5)
+
+
+def test_summarize():
+    s = summarize([1.0, 2.0, 3.0, 10.0], np.random.default_rng(0))
+    assert s["n"] == 4
+    assert s["mean"] == 4.0
+    assert s["median"] == 2.5
+    assert s["ci_low"] <= s["mean"] <= s["ci_high"]
+
+
+def make_cells(sizes, variants=("a", "b"), log=None):
+    backend = SimpleNamespace(name="mongodb", label="MongoDB")
+    log = [] if log is None else log
+
+    def measure(size, variant):
+        def run(warmup):
+            log.append((size, variant, warmup))
+            return {"t": float(size)}
+        return run
+
+    return [Cell(backend, size, v, measure(size, v)) for size in sizes for v in variants], log
+
+
+def test_run_cells_runs_warmups_then_repetitions():
+    cells, log = make_cells([10, 20])
+    samples = run_cells(cells, warmup=1, repetitions=3, seed=1)
+    assert len(log) == 4 * (1 + 3)
+    assert all(warmup for _, _, warmup in log[:4])
+    assert not any(warmup for _, _, warmup in log[4:])
+    assert samples[("mongodb", 10, "a")] == {"t": [10.0] * 3}
+
+
+def test_run_cells_order_depends_on_seed_only():
+    orders = []
+    for _ in range(2):
+        cells, log = make_cells([10, 20, 30])
+        run_cells(cells, seed=5)
+        orders.append(log)
+    assert orders[0] == orders[1]
+
+
+def size_blocks(log):
+    """Sizes in execution order with consecutive repeats collapsed."""
+    blocks = []
+    for size, _, _ in log:
+        if not blocks or blocks[-1] != size:
+            blocks.append(size)
+    return blocks
+
+
+def test_by_size_ascending():
+    cells, log = make_cells([30, 10, 20])
+    run_cells(cells, warmup=1, repetitions=2, by_size="ascending")
+    assert size_blocks(log) == [10, 20, 30]
+    for size in (10, 20, 30):
+        # each size still starts with its warmups
+        warmups = [warmup for s, _, warmup in log if s == size]
+        assert warmups == sorted(warmups, reverse=True)
+
+
+def test_by_size_shuffled_keeps_sizes_together():
+    cells, log = make_cells([10, 20, 30, 40])
+    run_cells(cells, warmup=1, repetitions=2, seed=3, by_size="shuffled")
+    blocks = size_blocks(log)
+    assert sorted(blocks) == [10, 20, 30, 40]
+
+
+def test_resume_skips_recorded_passes():
+    cells, log = make_cells([10, 20])
+    done = {(("mongodb", 10, "a"), 0): {"t": 1.0}, (("mongodb", 10, "a"), 1): {"t": 2.0}}
+    recorded = []
+    samples = run_cells(cells, warmup=1, repetitions=2, seed=1, done=done,
+                        record=lambda key, rep, metrics: recorded.append((key, rep)))
+    # the finished cell is not run again, not even its warmup
+    assert (10, "a", True) not in log and (10, "a", False) not in log
+    assert len(log) == 3 * (1 + 2)
+    assert samples[("mongodb", 10, "a")] == {"t": [1.0, 2.0]}
+    assert samples[("mongodb", 20, "b")] == {"t": [20.0, 20.0]}
+    assert len(recorded) == 3 * 2 and (("mongodb", 10, "a"), 0) not in recorded
+
+
+def test_resume_keeps_warmup_of_partly_done_cells():
+    cells, log = make_cells([10], variants=("a",))
+    run_cells(cells, warmup=1, repetitions=3, done={(("mongodb", 10, "a"), 1): {"t": 5.0}})
+    assert log == [(10, "a", True), (10, "a", False), (10, "a", False)]
+
+
+def test_resume_replays_the_same_schedule():
+    cells, full = make_cells([10, 20, 30])
+    passes = []
+    run_cells(cells, warmup=0, repetitions=2, seed=9, record=lambda key, rep, metrics: passes.append((key, rep)))
+    # as if the run died after its first four passes
+    done = {p: {"t": float(p[0][1])} for p in passes[:4]}
+    cells, resumed = make_cells([10, 20, 30])
+    run_cells(cells, warmup=0, repetitions=2, seed=9, done=done)
+    assert resumed == full[4:]